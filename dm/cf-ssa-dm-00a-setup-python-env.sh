@@ -102,6 +102,7 @@ pip install \
     selenium \
     webdriver_manager \
     geopandas \
+    pyogrio \
     rasterio \
     pyarrow \
     seaborn \
@@ -111,16 +112,25 @@ pip install \
     glob2 \
     shapely \
     fuzzywuzzy \
+    rapidfuzz \
     python-levenshtein \
     xarray \
+    dask \
+    flox \
+    bottleneck \
     netCDF4 \
     h5netcdf \
+    zarr \
+    cfgrib \
+    eccodes \
     cartopy \
     folium \
     plotly \
     scipy \
     scikit-learn \
     cdsapi \
+    aiohttp \
+    aiofiles \
     libmagic
 
 # Check if installation was successful
@@ -7,14 +7,34 @@
 
 
 # Import packages
+import io
+import os
+import sys
 import geopandas as gpd
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import shapely
 from shapely.geometry import Polygon, MultiPolygon
 from shapely.ops import unary_union
 import warnings
 warnings.filterwarnings('ignore')
+# Filtered frames share buffers with their parent until written to, so the cleaning steps can reassign
+# self.gdf without .copy() (always on from pandas 3, where the option is deprecated)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
+# Attribute columns used by the cleaning steps and by the downstream climate scripts
+SHAPEFILE_COLUMNS = ['COUNTRY', 'CNTRY_CD', 'SMALLEST', 'BPL_NAME', 'GEOLEV1', 'GEOLEV2']
+# Low-cardinality columns stored as categoricals (integer codes instead of repeated Python strings)
+CATEGORICAL_COLUMNS = ['COUNTRY', 'CNTRY_CD', 'BPL_NAME']
+# Threads for geometry repairs; GEOS releases the GIL, so these run in parallel
+REPAIR_WORKERS = os.cpu_count() or 1
+# Column formatting for example tables printed with to_string
+EXAMPLE_FORMATTERS = {'_area': '{:.8f}'.format}
 
 
 # Class:    ShapefileCleaner
@@ -25,6 +45,7 @@ class SSAShapefileCleaner:
         self.output_path = output_path
         self.overleaf_path = overleaf_path
         self.gdf = None
+        self._bpl_unknown_mask = None
         self.cleaning_log = {
             'original_count': 0,
             'steps': [],
@@ -45,6 +66,11 @@ class SSAShapefileCleaner:
         if details:
             print(f"  Details: {details}")
     
+    # Write a side-output table to CSV
+    def _write_csv(self, df, csv_path):
+        """Write a DataFrame (without its index) with pyarrow's C++ CSV writer"""
+        pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), csv_path)
+
     # Load raw shapefile 
     def load_data(self):
         """Load the shapefile"""
@@ -52,8 +78,15 @@ class SSAShapefileCleaner:
         print("=" * 20)
         
         try:
-            self.gdf = gpd.read_file(self.input_path)
+            # pyogrio reads fields and geometries in bulk through GDAL (via Arrow) instead of row by row through Fiona
+            self.gdf = gpd.read_file(self.input_path, engine="pyogrio", use_arrow=True, columns=SHAPEFILE_COLUMNS)
             self.gdf.loc[self.gdf['COUNTRY'] == "Côte d'Ivoire", 'COUNTRY'] = 'Ivory Coast'
+            for col in CATEGORICAL_COLUMNS:
+                self.gdf[col] = self.gdf[col].astype('category')
+            # Any other text columns become Arrow-backed strings instead of Python object arrays
+            text_columns = self.gdf.columns[(self.gdf.dtypes == object) & (self.gdf.columns != self.gdf.geometry.name)]
+            self.gdf[text_columns] = self.gdf[text_columns].astype('string[pyarrow]')
+            self._bpl_unknown_mask = self._find_unknown_bpl(self.gdf['BPL_NAME'])
             self.cleaning_log['original_count'] = len(self.gdf)
             print(f"✓ Loaded {len(self.gdf):,} records from {self.input_path}")
             return True
@@ -61,6 +94,18 @@ class SSAShapefileCleaner:
             print(f"❌ Error loading shapefile: {e}")
             return False
         
+    # Flag BPL_NAME values containing 'unknown' (case-insensitive)
+    def _find_unknown_bpl(self, bpl_name):
+        """Boolean Series; the substring search runs on the categories rather than on every row"""
+        categories = bpl_name.cat.categories
+        unknown_categories = categories[categories.astype(str).str.contains('unknown', case=False, regex=False)]
+        return bpl_name.isin(unknown_categories)
+
+    # Unknown-BPL_NAME mask, computed once at load, aligned to the rows still in self.gdf
+    def _unknown_bpl_rows(self):
+        """Cached 'unknown' BPL_NAME mask for the current records"""
+        return self._bpl_unknown_mask.loc[self.gdf.index]
+
     # Check whether dataset is uniquely identifiable at SMALLEST level
     def check_smallest_identifiability(self):
         """Check if dataset is uniquely identifiable at SMALLEST level and detect duplicate BPL_NAME mappings"""
@@ -68,15 +113,18 @@ class SSAShapefileCleaner:
         print("-" * 45)
         
         # Filter for valid SMALLEST values
-        valid_data = self.gdf[self.gdf['SMALLEST'].notna()].copy()
+        valid_data = self.gdf[self.gdf['SMALLEST'].notna()]
         
         print(f"Total records with valid SMALLEST: {len(valid_data):,}")
         
+        # Group once; the example printouts below look groups up instead of re-filtering valid_data
+        groups = valid_data.groupby('SMALLEST')
+        
         # Check 1: Are SMALLEST values unique (one row per SMALLEST)?
-        smallest_counts = valid_data['SMALLEST'].value_counts()
-        duplicates = smallest_counts[smallest_counts > 1]
+        dup_mask = valid_data['SMALLEST'].duplicated(keep=False)
+        duplicates = valid_data.loc[dup_mask, 'SMALLEST'].value_counts()
         
-        print(f"\nUnique SMALLEST values: {len(smallest_counts):,}")
+        print(f"\nUnique SMALLEST values: {groups.ngroups:,}")
         print(f"Duplicate SMALLEST values: {len(duplicates):,}")
         
         if len(duplicates) > 0:
@@ -87,14 +135,14 @@ class SSAShapefileCleaner:
             print("\nExamples of duplicate SMALLEST values:")
             for smallest_val, count in duplicates.head(5).items():
                 print(f"  SMALLEST {smallest_val}: {count} records")
-                dup_rows = valid_data[valid_data['SMALLEST'] == smallest_val][['COUNTRY', 'BPL_NAME', 'SMALLEST']]
+                dup_rows = groups.get_group(smallest_val)[['COUNTRY', 'BPL_NAME', 'SMALLEST']]
                 print(dup_rows.to_string(index=False))
                 print()
         else:
             print(f"✓ Dataset IS uniquely identifiable at SMALLEST level (no duplicates)")
         
         # Check 2: Multiple BPL_NAME values for same SMALLEST?
-        smallest_bpl_groups = valid_data.groupby('SMALLEST')['BPL_NAME'].apply(lambda x: x.nunique())
+        smallest_bpl_groups = groups['BPL_NAME'].nunique()
         multiple_bpl = smallest_bpl_groups[smallest_bpl_groups > 1]
         
         print(f"\nSMALLEST units with multiple BPL_NAME values: {len(multiple_bpl):,}")
@@ -105,8 +153,9 @@ class SSAShapefileCleaner:
             # Show examples
             print("\nExamples of SMALLEST units with multiple BPL_NAME values:")
             for smallest_val, bpl_count in multiple_bpl.head(5).items():
-                bpl_names = valid_data[valid_data['SMALLEST'] == smallest_val]['BPL_NAME'].unique()
-                country = valid_data[valid_data['SMALLEST'] == smallest_val]['COUNTRY'].iloc[0]
+                group = groups.get_group(smallest_val)
+                bpl_names = group['BPL_NAME'].unique()
+                country = group['COUNTRY'].iat[0]
                 print(f"  SMALLEST {smallest_val} ({country}): {bpl_count} different BPL_NAMEs")
                 for bpl in bpl_names:
                     print(f"    - '{bpl}'")
@@ -121,7 +170,7 @@ class SSAShapefileCleaner:
                 "data/derived/shapefiles/cleaned_ssa_boundaries.shp", 
                 "data/documentation/shapefile-cleaning/smallest-multiple-bpl-names.csv"
             )
-            problematic_records.to_csv(csv_path, index=False)
+            self._write_csv(problematic_records, csv_path)
             print(f"✓ Full list saved to: {csv_path}")
         else:
             print(f"✓ Each SMALLEST unit has a unique BPL_NAME")
@@ -146,7 +195,7 @@ class SSAShapefileCleaner:
         print("-" * 55)
         
         # Case-insensitive search for 'unknown' in BPL_NAME
-        unknown_bpl_mask = self.gdf['BPL_NAME'].astype(str).str.lower().str.contains('unknown', na=False)
+        unknown_bpl_mask = self._unknown_bpl_rows()
         unknown_count = unknown_bpl_mask.sum()
         
         # Check which of these have valid geometries
@@ -160,11 +209,12 @@ class SSAShapefileCleaner:
         
         if unknown_with_valid_geom_count > 0:
             # Show examples of unknown entries with valid geometries
-            unknown_valid_examples = self.gdf[unknown_with_valid_geom][['COUNTRY', 'BPL_NAME', 'SMALLEST']].head(5)
+            unknown_valid_examples = self.gdf.loc[unknown_with_valid_geom, ['COUNTRY', 'BPL_NAME', 'SMALLEST', 'geometry']].head(5)
+            unknown_valid_examples = pd.DataFrame(unknown_valid_examples.drop(columns='geometry')).assign(
+                _area=shapely.area(unknown_valid_examples.geometry.to_numpy())
+            )
             print("Examples of 'unknown' BPL_NAME entries with valid geometries:")
-            for idx, row in unknown_valid_examples.iterrows():
-                area = self.gdf.loc[idx, 'geometry'].area if hasattr(self.gdf.loc[idx, 'geometry'], 'area') else 'N/A'
-                print(f"  {row['COUNTRY']} - '{row['BPL_NAME']}' (SMALLEST: {row['SMALLEST']}, Area: {area:.8f})")
+            print(unknown_valid_examples.to_string(index=False, formatters=EXAMPLE_FORMATTERS))
         
         return unknown_with_valid_geom_count
 
@@ -174,9 +224,10 @@ class SSAShapefileCleaner:
         print("\nSTEP 1: REMOVING NULL GEOMETRIES")
         print("-" * 35)
         
-        null_geoms_mask = self.gdf.geometry.isnull()
-        null_geoms = self.gdf.geometry.isnull().sum()
-        print(f"Found {null_geoms:,} null geometries")
+        # One mask for missing and empty geometries, reused for the report, the export and the filter
+        null_geoms_mask = self.gdf.geometry.isna() | self.gdf.geometry.is_empty
+        null_geoms = null_geoms_mask.sum()
+        print(f"Found {null_geoms:,} null or empty geometries")
         
         if null_geoms > 0:
             print("\nListing COUNTRY and SMALLEST for null geometries")
@@ -184,24 +235,28 @@ class SSAShapefileCleaner:
             null_records = self.gdf.loc[null_geoms_mask, ["COUNTRY", "SMALLEST", "BPL_NAME"]]
             print(null_records)
             csv_path = self.output_path.replace("data/derived/shapefiles/cleaned_ssa_boundaries.shp", "data/documentation/shapefile-cleaning/ssa-shapefile-null-geometries.csv")
-            null_records.to_csv(csv_path, index = False)
+            self._write_csv(null_records, csv_path)
 
             # Show distribution by country
-            null_by_country = self.gdf[self.gdf.geometry.isnull()]['COUNTRY'].value_counts()
+            null_by_country = self.gdf.loc[null_geoms_mask, 'COUNTRY'].cat.remove_unused_categories().value_counts()
             print("Null geometries by country:")
             for country, count in null_by_country.head(10).items():
                 print(f"  {country}: {count}")
             
             # Check how many of these null geometries have 'unknown' in BPL_NAME
-            null_geoms_mask = self.gdf.geometry.isnull()
-            unknown_in_null = self.gdf[null_geoms_mask]['BPL_NAME'].astype(str).str.lower().str.contains('unknown', na=False).sum()
+            unknown_in_null = (self._unknown_bpl_rows() & null_geoms_mask).sum()
             print(f"Null geometries with 'unknown' in BPL_NAME: {unknown_in_null}")
             
-            # Remove null geometries
-            self.gdf = self.gdf[self.gdf.geometry.notna()].copy()
+            # Remove null geometries; the index is reset so later steps can use row positions,
+            # and the cached unknown-BPL_NAME mask is realigned to it
+            self._bpl_unknown_mask = self._unknown_bpl_rows()[~null_geoms_mask].reset_index(drop=True)
+            self.gdf = self.gdf.loc[~null_geoms_mask].reset_index(drop=True)
             self.log_step("Remove null geometries", null_geoms, len(self.gdf))
         else:
             print("No null geometries found")
+        
+        # Every remaining record has a geometry: compute areas once and reuse them in later steps
+        self.gdf['_area'] = shapely.area(self.gdf.geometry.to_numpy())
     
     # Check whether there is an overlap between `unknown` BPL_NAME and null geometries
     def check_unknown_bpl_geometry_overlap(self):
@@ -210,17 +265,15 @@ class SSAShapefileCleaner:
         print("-" * 55)
         
         # Since we already removed null geometries, check in remaining data
-        unknown_bpl = self.gdf['BPL_NAME'].astype(str).str.lower().str.contains('unknown', na=False)
+        unknown_bpl = self._unknown_bpl_rows()
         unknown_count = unknown_bpl.sum()
         
         print(f"Unknown BPL_NAME entries in remaining data: {unknown_count}")
         
         if unknown_count > 0:
-            unknown_examples = self.gdf[unknown_bpl][['COUNTRY', 'BPL_NAME', 'SMALLEST']].head(5)
+            unknown_examples = self.gdf.loc[unknown_bpl, ['COUNTRY', 'BPL_NAME', 'SMALLEST', '_area']].head(5)
             print("Examples of remaining unknown BPL_NAME entries:")
-            for idx, row in unknown_examples.iterrows():
-                area = self.gdf.loc[idx, 'geometry'].area if hasattr(self.gdf.loc[idx, 'geometry'], 'area') else 'N/A'
-                print(f"  {row['COUNTRY']} - '{row['BPL_NAME']}' (SMALLEST: {row['SMALLEST']}, Area: {area:.8f})")
+            print(unknown_examples.to_string(index=False, formatters=EXAMPLE_FORMATTERS))
 
     # Remove very small geometries (potential slivers) 
         # If a geometry falls below the 1st percentile of area sizes, consider it a sliver and remove it
@@ -229,9 +282,9 @@ class SSAShapefileCleaner:
         print(f"\nSTEP 2: REMOVING VERY SMALL GEOMETRIES (< {percentile_threshold}st PERCENTILE)")
         print("-" * 65)
         
-        # Calculate areas
-        areas = self.gdf.geometry.area
-        threshold = areas.quantile(percentile_threshold / 100)
+        # Areas were computed once after removing null geometries
+        areas = self.gdf['_area'].to_numpy()
+        threshold = np.nanquantile(areas, percentile_threshold / 100)
         very_small_mask = areas < threshold
         very_small_count = very_small_mask.sum()
         
@@ -240,14 +293,13 @@ class SSAShapefileCleaner:
         
         if very_small_count > 0:
             # Show examples
-            small_examples = self.gdf[very_small_mask][['COUNTRY', 'BPL_NAME', 'SMALLEST']].head(5)
+            example_positions = np.flatnonzero(very_small_mask)[:5]
+            small_examples = self.gdf.iloc[example_positions][['COUNTRY', 'BPL_NAME', 'SMALLEST', '_area']]
             print("Examples of very small geometries:")
-            for idx, row in small_examples.iterrows():
-                area_val = areas.loc[idx]
-                print(f"  {row['COUNTRY']} - {row['BPL_NAME']} (Area: {area_val:.8f})")
+            print(small_examples.to_string(index=False, formatters=EXAMPLE_FORMATTERS))
             
             # Remove very small geometries
-            self.gdf = self.gdf[~very_small_mask].copy()
+            self.gdf = self.gdf.iloc[~very_small_mask]
             self.log_step("Remove very small geometries", very_small_count, len(self.gdf), 
                          f"Threshold: {threshold:.8f}")
         else:
@@ -279,8 +331,7 @@ class SSAShapefileCleaner:
             
             # Show examples
             print("Examples of records with missing SMALLEST:")
-            for idx, row in missing_data[['COUNTRY', 'BPL_NAME', 'GEOLEV1', 'GEOLEV2']].head().iterrows():
-                print(f"  {row['COUNTRY']} - {row['BPL_NAME']} (GEOLEV1: {row['GEOLEV1']}, GEOLEV2: {row['GEOLEV2']})")
+            print(missing_data[['COUNTRY', 'BPL_NAME', 'GEOLEV1', 'GEOLEV2']].head(5).to_string(index=False))
             
             # Remove records with no SMALLEST and no GEOLEV information
             no_admin_info = missing_smallest & self.gdf['GEOLEV1'].isnull() & self.gdf['GEOLEV2'].isnull()
@@ -288,7 +339,7 @@ class SSAShapefileCleaner:
             
             if no_admin_count > 0:
                 print(f"Removing {no_admin_count} records with no SMALLEST and no GEOLEV info")
-                self.gdf = self.gdf[~no_admin_info].copy()
+                self.gdf = self.gdf[~no_admin_info]
                 self.log_step("Remove records with no admin info", no_admin_count, len(self.gdf))
             
             # For remaining records with missing SMALLEST but have GEOLEV, keep them for now
@@ -307,20 +358,14 @@ class SSAShapefileCleaner:
         # Work with records that have complete country/code data
         complete_data = self.gdf[(self.gdf['COUNTRY'].notna()) & 
                                (self.gdf['CNTRY_CD'].notna()) & 
-                               (self.gdf['SMALLEST'].notna())].copy()
+                               (self.gdf['SMALLEST'].notna())]
         
         if len(complete_data) == 0:
             print("No records with complete country/code data")
             return
         
-        complete_data['SMALLEST_str'] = complete_data['SMALLEST'].astype(str)
-        complete_data['CNTRY_CD_str'] = complete_data['CNTRY_CD'].astype(str)
-        
         # Find mismatches
-        def check_mismatch(row):
-            return not str(row['SMALLEST_str']).startswith(str(row['CNTRY_CD_str']))
-        
-        mismatch_mask = complete_data.apply(check_mismatch, axis=1)
+        mismatch_mask = ~self._country_code_matches(complete_data)
         mismatched_indices = complete_data[mismatch_mask].index
         mismatch_count = len(mismatched_indices)
         
@@ -329,7 +374,7 @@ class SSAShapefileCleaner:
         if mismatch_count > 0:
             # Show by country
             mismatched_data = complete_data[mismatch_mask]
-            mismatch_by_country = mismatched_data['COUNTRY'].value_counts()
+            mismatch_by_country = mismatched_data['COUNTRY'].cat.remove_unused_categories().value_counts()
             print("Mismatches by country:")
             for country, count in mismatch_by_country.items():
                 print(f"  {country}: {count}")
@@ -338,28 +383,15 @@ class SSAShapefileCleaner:
             print("ALL RECORDS BEING DELETED.")
             print("="*80)
 
-            # Display all mismatched records with more detail
-            for idx, row in mismatched_data.iterrows():
-                print(f"\nIndex: {idx}")
-                print(f"  COUNTRY: {row['COUNTRY']}")
-                print(f"  CNTRY_CD: {row['CNTRY_CD']}")
-                print(f"  SMALLEST: {row['SMALLEST']}")
-                print(f"  BPL_NAME: {row.get('BPL_NAME', 'N/A')}")
-
-                # Show all available columns for this record
-                print("All columns: ")
-                for col in mismatched_data.columns:
-                    if col not in ['COUNTRY', 'CNTRY_CD', 'SMALLEST', 'BPL_NAME', 'geometry']:
-                        value = row[col]
-                        if pd.notna(value) and str(value).strip() != '':
-                            print(f".    {col}: {value}")
+            # Display all mismatched records with all their attribute columns
+            print(pd.DataFrame(mismatched_data.drop(columns='geometry')).to_string(formatters=EXAMPLE_FORMATTERS))
 
             print("\n" + "="*80)
         
             # Create a summary DataFrame of deleted records
-            deleted_summary = mismatched_data[['COUNTRY', 'CNTRY_CD', 'SMALLEST', 'BPL_NAME']].copy()
-            deleted_summary['mismatch_reason'] = deleted_summary.apply(
-                lambda x: f"SMALLEST ({x['SMALLEST']}) doesn't start with CNTRY_CD ({x['CNTRY_CD']})", axis=1
+            deleted_summary = mismatched_data[['COUNTRY', 'CNTRY_CD', 'SMALLEST', 'BPL_NAME']].assign(
+                mismatch_reason="SMALLEST (" + mismatched_data['SMALLEST'].astype(str)
+                + ") doesn't start with CNTRY_CD (" + mismatched_data['CNTRY_CD'].astype(str) + ")"
             )
 
             print("SUMMARY OF DELETED RECORDS:")
@@ -377,6 +409,13 @@ class SSAShapefileCleaner:
         else:
             print("No country code mismatches found")
     
+    # Check, element-wise in numpy, whether SMALLEST starts with CNTRY_CD
+    def _country_code_matches(self, data):
+        """Boolean Series: True where the SMALLEST code starts with the CNTRY_CD code"""
+        smallest_str = data['SMALLEST'].to_numpy().astype(str)
+        cntry_cd_str = data['CNTRY_CD'].to_numpy().astype(str)
+        return pd.Series(np.char.startswith(smallest_str, cntry_cd_str), index=data.index)
+
     # Resolve sliver overlaps with multiple strategies
     def resolve_sliver_overlaps(self):
         """Resolve sliver overlaps with multiple repair strategies"""
@@ -385,116 +424,117 @@ class SSAShapefileCleaner:
         
         print("Identifying overlapping geometries...")
         
-        # Create a copy for processing
-        working_gdf = self.gdf.copy()
-        spatial_index = working_gdf.sindex
-        overlaps_to_resolve = []
+        # Work on a RangeIndex so row labels and tree/array positions are the same thing
+        self._bpl_unknown_mask = self._unknown_bpl_rows().reset_index(drop=True)
+        working_gdf = self.gdf.reset_index(drop=True)
+        # Geometry is the only column the repairs change, so only the geometry array is copied
+        # (to_numpy returns the frame's own storage); the frame itself is updated once at the end
+        geoms = working_gdf.geometry.to_numpy().copy()
+        areas = working_gdf['_area'].to_numpy(copy=True)
 
-        total_geometries = len(working_gdf)
-        processed = 0
-        
-        print(f"Processing {total_geometries} geometries with spatial index...")
-        
-        # Get the actual index values as a list for lookup
-        df_index_values = working_gdf.index.tolist()
-        
-        for idx, row in working_gdf.iterrows():
-            processed += 1
-            if processed % 100 == 0:
-                print(f"  Processed {processed}/{total_geometries} geometries...")
-            
-            geom = row['geometry']
-            
-            # Get potential candidates using spatial index
-            possible_matches_positions = list(spatial_index.intersection(geom.bounds))
-            
-            for candidate_pos in possible_matches_positions:
-                # Convert positional index to DataFrame index
-                candidate_idx = df_index_values[candidate_pos]
-                
-                # Avoid self-comparison and duplicates
-                if idx >= candidate_idx:
-                    continue
-                    
-                candidate_geom = working_gdf.loc[candidate_idx, 'geometry']
-                
-                try: 
-                    # Check for actual overlap
-                    if geom.overlaps(candidate_geom):
-                        intersection = geom.intersection(candidate_geom)
-                        overlap_area = intersection.area 
+        print(f"Processing {len(working_gdf)} geometries with spatial index...")
 
-                        # Calculate overlap percentages
-                        area1 = geom.area
-                        area2 = candidate_geom.area
-                        overlap_pct1 = (overlap_area / area1 * 100) if area1 > 0 else 0
-                        overlap_pct2 = (overlap_area / area2 * 100) if area2 > 0 else 0
-                        
-                        # Consider as sliver if overlap is < 5% of either polygon
-                        if overlap_pct1 < 5 and overlap_pct2 < 5:
-                            overlaps_to_resolve.append({
-                                'idx1': idx,
-                                'idx2': candidate_idx,
-                                'overlap_area': overlap_area,
-                                'overlap_pct1': overlap_pct1,
-                                'overlap_pct2': overlap_pct2
-                            })
-                            
-                except Exception as e:
-                    continue
+        # One bulk STRtree query returns every overlapping pair; keep each pair once
+        left, right = shapely.STRtree(geoms).query(geoms, predicate="overlaps")
+        keep = left < right
+        left, right = left[keep], right[keep]
+        print(f"  Found {len(left)} overlapping pairs")
+
+        area1 = areas[left]
+        area2 = areas[right]
+
+        # The envelopes' intersection area bounds the true overlap from above, so pairs whose
+        # bound is already under 5% of both polygons are slivers without any GEOS call
+        bounds = shapely.bounds(geoms)
+        width = np.minimum(bounds[left, 2], bounds[right, 2]) - np.maximum(bounds[left, 0], bounds[right, 0])
+        height = np.minimum(bounds[left, 3], bounds[right, 3]) - np.maximum(bounds[left, 1], bounds[right, 1])
+        overlap_area = np.clip(width, 0, None) * np.clip(height, 0, None)
+        undecided = np.flatnonzero((overlap_area * 100 >= 5 * area1) | (overlap_area * 100 >= 5 * area2))
+        print(f"  {len(left) - len(undecided)} pairs are slivers by envelope; intersecting the other {len(undecided)}")
+
+        # Exact overlap areas for the remaining pairs in one vectorised GEOS call
+        overlap_area[undecided] = self._pairwise_intersection_area(geoms[left[undecided]], geoms[right[undecided]])
+        overlap_pct1 = np.divide(overlap_area * 100, area1, out=np.zeros_like(area1), where=area1 > 0)
+        overlap_pct2 = np.divide(overlap_area * 100, area2, out=np.zeros_like(area2), where=area2 > 0)
+
+        # Consider as sliver if overlap is < 5% of either polygon
+        sliver = (overlap_pct1 < 5) & (overlap_pct2 < 5)
+        overlaps_to_resolve = [
+            {
+                'pos1': pos1,
+                'pos2': pos2,
+                'overlap_area': area,
+                'overlap_pct1': pct1,
+                'overlap_pct2': pct2
+            }
+            for pos1, pos2, area, pct1, pct2 in zip(
+                left[sliver], right[sliver], overlap_area[sliver], overlap_pct1[sliver], overlap_pct2[sliver]
+            )
+        ]
         
         print(f"Found {len(overlaps_to_resolve)} sliver overlaps to resolve")
         
         if len(overlaps_to_resolve) > 0:
-            # Resolve overlaps by modifying geometries
-            resolved_count = 0
+            # Resolve overlaps by modifying geometries; repairs edit the positional
+            # geoms array in place and are written back to the frame once at the end
             problematic_geometries = []
             
-            print("Resolving overlaps with multiple repair strategies...")
+            # Pairs that share no geometry with any other pair are independent, so the
+            # default difference repair can run on all of them in one vectorised batch
+            pos1 = np.array([overlap['pos1'] for overlap in overlaps_to_resolve])
+            pos2 = np.array([overlap['pos2'] for overlap in overlaps_to_resolve])
+            counts = np.bincount(np.concatenate([pos1, pos2]), minlength=len(geoms))
+            isolated = np.flatnonzero((counts[pos1] == 1) & (counts[pos2] == 1))
+            batch_ok = self._batch_repair_difference(geoms, pos1[isolated], pos2[isolated])
+            resolved_count = int(batch_ok.sum())
+            print(f"Repaired {resolved_count} of {len(isolated)} independent overlaps in one batch")
             
-            for i, overlap in enumerate(overlaps_to_resolve):
-                if i % 50 == 0:
-                    print(f"  Processed {i}/{len(overlaps_to_resolve)} overlaps...")
-                    
-                idx1, idx2 = overlap['idx1'], overlap['idx2']
-                
-                # Skip if either geometry was already removed
-                if idx2 not in working_gdf.index or idx1 not in working_gdf.index:
-                    continue
-                    
-                success = self._repair_overlap(working_gdf, idx1, idx2, overlap)
-                
-                if success:
-                    resolved_count += 1
-                else:
-                    problematic_geometries.append(idx2)
+            # Everything else goes through the per-pair strategies, in order
+            done = set(isolated[batch_ok])
+            remaining = [overlap for i, overlap in enumerate(overlaps_to_resolve) if i not in done]
+            
+            # Overlaps chained through shared geometries form connected components; each
+            # component is repaired in order on one thread, and different components touch
+            # disjoint geometries, so they can run side by side
+            components = self._overlap_components(remaining)
+            print(f"Resolving remaining {len(remaining)} overlaps ({len(components)} independent groups) "
+                  "with multiple repair strategies...")
+            
+            with ThreadPoolExecutor(max_workers=REPAIR_WORKERS) as executor:
+                for resolved, problematic in executor.map(lambda component: self._repair_component(geoms, component), components):
+                    resolved_count += resolved
+                    problematic_geometries.extend(problematic)
             
             # Only remove geometries if absolutely necessary
+            final_problematic = []
             if problematic_geometries:
                 # Remove duplicates
-                problematic_geometries = list(set(problematic_geometries))
+                problematic_geometries = sorted(set(problematic_geometries))
                 print(f"⚠️  Could not clean {len(problematic_geometries)} geometries")
                 print("Attempting buffer-based repair before removal...")
                 
-                # Try buffer repair on problematic geometries
-                final_problematic = []
-                for idx in problematic_geometries:
-                    if self._try_buffer_repair(working_gdf, idx):
-                        print(f"  ✓ Repaired geometry {idx} with buffer method")
+                # Try buffer repair on problematic geometries (each touches only its own geometry)
+                with ThreadPoolExecutor(max_workers=REPAIR_WORKERS) as executor:
+                    repaired = list(executor.map(lambda pos: self._try_buffer_repair(geoms, pos), problematic_geometries))
+                for pos, success in zip(problematic_geometries, repaired):
+                    if success:
+                        print(f"  ✓ Repaired geometry {pos} with buffer method")
                         resolved_count += 1
                     else:
-                        final_problematic.append(idx)
-                        print(f"  ✗ Could not repair geometry {idx}")
-                
-                # Only remove if all repair attempts failed
-                if final_problematic:
-                    print(f"Removing {len(final_problematic)} geometries that couldn't be cleaned")
-                    working_gdf = working_gdf.drop(final_problematic)
-                    removed_count = len(final_problematic)
-                else:
-                    removed_count = 0
-            else:
-                removed_count = 0
+                        final_problematic.append(pos)
+                        print(f"  ✗ Could not repair geometry {pos}")
+
+            # Refresh the cached areas only for geometries a repair actually replaced
+            changed = np.flatnonzero([new is not old for new, old in zip(geoms, working_gdf.geometry.array)])
+            areas[changed] = shapely.area(geoms[changed])
+            working_gdf['geometry'] = gpd.GeoSeries(geoms, index=working_gdf.index, crs=working_gdf.crs)
+            working_gdf['_area'] = areas
+
+            # Only remove if all repair attempts failed
+            if final_problematic:
+                print(f"Removing {len(final_problematic)} geometries that couldn't be cleaned")
+                working_gdf = working_gdf.drop(final_problematic)
+            removed_count = len(final_problematic)
             
             self.gdf = working_gdf
             self.log_step("Resolve sliver overlaps", removed_count, len(self.gdf), 
@@ -502,7 +542,78 @@ class SSAShapefileCleaner:
         else:
             print("No sliver overlaps found to resolve")
 
-    def _repair_overlap(self, working_gdf, idx1, idx2, overlap):
+    # Intersection areas of paired geometries
+    def _pairwise_intersection_area(self, geoms1, geoms2):
+        """Vectorised intersection area; falls back to pair by pair (NaN on GEOS errors) if the bulk call fails"""
+        try:
+            return shapely.area(shapely.intersection(geoms1, geoms2))
+        except shapely.errors.GEOSException:
+            areas = np.full(len(geoms1), np.nan)
+            for i, (geom1, geom2) in enumerate(zip(geoms1, geoms2)):
+                try:
+                    areas[i] = geom1.intersection(geom2).area
+                except shapely.errors.GEOSException:
+                    continue
+            return areas
+
+    # Group overlaps that share a geometry (union-find over geometry positions)
+    def _overlap_components(self, overlaps):
+        """List of overlap lists; components share no geometries and keep the original order"""
+        parent = {}
+
+        def find(pos):
+            parent.setdefault(pos, pos)
+            while parent[pos] != pos:
+                parent[pos] = parent[parent[pos]]
+                pos = parent[pos]
+            return pos
+
+        for overlap in overlaps:
+            parent[find(overlap['pos1'])] = find(overlap['pos2'])
+
+        components = {}
+        for overlap in overlaps:
+            components.setdefault(find(overlap['pos1']), []).append(overlap)
+        return list(components.values())
+
+    # Repair one component's overlaps in order
+    def _repair_component(self, geoms, overlaps):
+        """Return (number resolved, positions that could not be cleaned)"""
+        resolved = 0
+        problematic = []
+        for overlap in overlaps:
+            if self._repair_overlap(geoms, overlap['pos1'], overlap['pos2'], overlap):
+                resolved += 1
+            else:
+                problematic.append(overlap['pos2'])
+        return resolved, problematic
+
+    # Vectorised difference-based repair over independent pairs
+    def _batch_repair_difference(self, geoms, pos1, pos2):
+        """Remove each pair's overlap from the second geometry; returns a mask of the pairs repaired"""
+        geoms1, geoms2 = geoms[pos1], geoms[pos2]
+        try:
+            cleaned = shapely.difference(geoms2, shapely.intersection(geoms1, geoms2))
+        except shapely.errors.GEOSException:
+            return np.zeros(len(pos1), dtype=bool)
+        ok = self._valid_polygons(cleaned)
+        geoms[pos2[ok]] = cleaned[ok]
+        return ok
+
+    # Vectorised counterpart of validate_polygon_geometry, used for whole-frame validation
+    def _valid_polygons(self, geoms):
+        """Mask of non-empty, valid Polygon/MultiPolygon geometries with positive area"""
+        type_ids = shapely.get_type_id(geoms)
+        valid = (
+            ((type_ids == shapely.GeometryType.POLYGON) | (type_ids == shapely.GeometryType.MULTIPOLYGON))
+            & ~shapely.is_empty(geoms)
+            & (shapely.area(geoms) > 0)
+        )
+        # is_valid is by far the most expensive check, so only run it on geometries that pass the cheap ones
+        valid[valid] = shapely.is_valid(geoms[valid])
+        return valid
+
+    def _repair_overlap(self, geoms, pos1, pos2, overlap):
         """Try multiple strategies to repair overlapping geometries"""
         strategies = [
             self._repair_difference,
@@ -513,7 +624,7 @@ class SSAShapefileCleaner:
         
         for strategy in strategies:
             try:
-                if strategy(working_gdf, idx1, idx2, overlap):
+                if strategy(geoms, pos1, pos2, overlap):
                     return True
             except Exception as e:
                 continue
@@ -521,39 +632,39 @@ class SSAShapefileCleaner:
         return False
 
     # Difference-based repair
-    def _repair_difference(self, working_gdf, idx1, idx2, overlap):
+    def _repair_difference(self, geoms, pos1, pos2, overlap):
         """Original difference-based repair"""
-        geom1 = working_gdf.loc[idx1, 'geometry']
-        geom2 = working_gdf.loc[idx2, 'geometry']
+        geom1 = geoms[pos1]
+        geom2 = geoms[pos2]
         intersection = geom1.intersection(geom2)
         
         geom2_cleaned = geom2.difference(intersection)
         
         if self.validate_polygon_geometry(geom2_cleaned):
-            working_gdf.loc[idx2, 'geometry'] = geom2_cleaned
+            geoms[pos2] = geom2_cleaned
             return True
         return False
 
     # Symmetric difference-based repair
-    def _repair_symmetric_difference(self, working_gdf, idx1, idx2, overlap):
+    def _repair_symmetric_difference(self, geoms, pos1, pos2, overlap):
         """Use symmetric difference and take larger part"""
-        geom1 = working_gdf.loc[idx1, 'geometry']
-        geom2 = working_gdf.loc[idx2, 'geometry']
+        geom1 = geoms[pos1]
+        geom2 = geoms[pos2]
         
         # Get the union of boundaries to create a clean split line
         boundary = geom1.boundary.union(geom2.boundary)
         geom2_cleaned = geom2.intersection(boundary.buffer(0.0001))  # Small buffer to ensure polygon
         
         if self.validate_polygon_geometry(geom2_cleaned) and geom2_cleaned.area > geom2.area * 0.8:
-            working_gdf.loc[idx2, 'geometry'] = geom2_cleaned
+            geoms[pos2] = geom2_cleaned
             return True
         return False
 
     # Remove overlap from polygon that loses least area
-    def _repair_smallest_overlap(self, working_gdf, idx1, idx2, overlap):
+    def _repair_smallest_overlap(self, geoms, pos1, pos2, overlap):
         """Remove overlap from the polygon that loses least area"""
-        geom1 = working_gdf.loc[idx1, 'geometry']
-        geom2 = working_gdf.loc[idx2, 'geometry']
+        geom1 = geoms[pos1]
+        geom2 = geoms[pos2]
         intersection = geom1.intersection(geom2)
         
         # Remove from the geometry that will lose smaller percentage of area
@@ -564,21 +675,21 @@ class SSAShapefileCleaner:
             # Remove from geom1
             geom1_cleaned = geom1.difference(intersection)
             if self.validate_polygon_geometry(geom1_cleaned):
-                working_gdf.loc[idx1, 'geometry'] = geom1_cleaned
+                geoms[pos1] = geom1_cleaned
                 return True
         else:
             # Remove from geom2 (original approach)
             geom2_cleaned = geom2.difference(intersection)
             if self.validate_polygon_geometry(geom2_cleaned):
-                working_gdf.loc[idx2, 'geometry'] = geom2_cleaned
+                geoms[pos2] = geom2_cleaned
                 return True
         return False
 
     # Boundary union-based repair
-    def _repair_boundary_union(self, working_gdf, idx1, idx2, overlap):
+    def _repair_boundary_union(self, geoms, pos1, pos2, overlap):
         """Use boundary union for clean separation"""
-        geom1 = working_gdf.loc[idx1, 'geometry']
-        geom2 = working_gdf.loc[idx2, 'geometry']
+        geom1 = geoms[pos1]
+        geom2 = geoms[pos2]
         
         # Create a clean boundary between the two
         union_boundary = geom1.boundary.union(geom2.boundary)
@@ -587,33 +698,33 @@ class SSAShapefileCleaner:
         geom2_cleaned = geom2.intersection(union_boundary.convex_hull)
         
         if self.validate_polygon_geometry(geom2_cleaned) and geom2_cleaned.area > 0:
-            working_gdf.loc[idx2, 'geometry'] = geom2_cleaned
+            geoms[pos2] = geom2_cleaned
             return True
         return False
 
     # Buffer-based repair attempts
-    def _try_buffer_repair(self, working_gdf, idx):
+    def _try_buffer_repair(self, geoms, pos):
         """Try to repair geometry using buffer tricks"""
         try:
-            geom = working_gdf.loc[idx, 'geometry']
+            geom = geoms[pos]
             
-            # Strategy 1: Simple buffer(0)
-            repaired = geom.buffer(0)
+            # Strategy 1: GEOS MakeValid (cheaper than buffer(0) and keeps the topology)
+            repaired = self._make_valid_polygon(geom)
             if self.validate_polygon_geometry(repaired):
-                working_gdf.loc[idx, 'geometry'] = repaired
+                geoms[pos] = repaired
                 return True
             
-            # Strategy 2: Small positive then negative buffer
+            # Strategy 2: Small positive then negative buffer (last-resort buffer trick)
             repaired = geom.buffer(0.0001).buffer(-0.0001)
             if self.validate_polygon_geometry(repaired):
-                working_gdf.loc[idx, 'geometry'] = repaired
+                geoms[pos] = repaired
                 return True
                 
             # Strategy 3: Convex hull as last resort
             if geom.geom_type == 'Polygon':
                 repaired = geom.convex_hull
                 if self.validate_polygon_geometry(repaired) and repaired.area > geom.area * 0.5:
-                    working_gdf.loc[idx, 'geometry'] = repaired
+                    geoms[pos] = repaired
                     return True
                     
         except Exception as e:
@@ -621,32 +732,19 @@ class SSAShapefileCleaner:
         
         return False
 
-    # Validate polygon geometry
-    def validate_polygon_geometry(self, geom):
-        """More lenient validation for sliver overlap repair"""
-        if geom is None or geom.is_empty:
-            return False
-        
-        # Check if it's a polygon or multipolygon
-        if not isinstance(geom, (Polygon, MultiPolygon)):
-            return False
-        
-        # Check if it's valid (be more tolerant)
-        if not geom.is_valid:
-            # Try to auto-repair with buffer(0)
-            try:
-                geom_repaired = geom.buffer(0)
-                if geom_repaired.is_valid and isinstance(geom_repaired, (Polygon, MultiPolygon)):
-                    return True
-            except:
-                pass
-            return False
-        
-        # More lenient area check for sliver repair
-        if geom.area <= 0:
-            return False
-        
-        return True     
+    # Repair an invalid geometry with GEOS MakeValid, keeping only its polygonal parts
+    def _make_valid_polygon(self, geom):
+        """MakeValid can return a collection with collapsed lines/points; drop those so the result stays (Multi)Polygon"""
+        return self._polygonal_part(shapely.make_valid(geom))
+
+    # Keep only the polygonal parts of a MakeValid result
+    def _polygonal_part(self, repaired):
+        """Collections are reduced to the union of their Polygon/MultiPolygon parts; anything else is returned as is"""
+        if repaired.geom_type != 'GeometryCollection':
+            return repaired
+        parts = shapely.get_parts(repaired)
+        polygons = parts[np.isin(shapely.get_type_id(parts), [shapely.GeometryType.POLYGON, shapely.GeometryType.MULTIPOLYGON])]
+        return shapely.union_all(polygons)
 
     # Validate polygon geometry     
     def validate_polygon_geometry(self, geom):
@@ -674,25 +772,45 @@ class SSAShapefileCleaner:
         print("\nSTEP 5.5: CLEANING INVALID GEOMETRIES")
         print("-" * 38)
         
-        # Check for invalid geometries
-        invalid_mask = ~self.gdf.geometry.apply(self.validate_polygon_geometry)
+        # Repair self-intersecting polygons with MakeValid (one vectorised GEOS call) rather than dropping them
+        geoms = self.gdf.geometry.to_numpy()
+        type_ids = shapely.get_type_id(geoms)
+        repairable = (
+            ((type_ids == shapely.GeometryType.POLYGON) | (type_ids == shapely.GeometryType.MULTIPOLYGON))
+            & ~shapely.is_empty(geoms)
+            & ~shapely.is_valid(geoms)
+        )
+        repair_count = int(repairable.sum())
+        if repair_count > 0:
+            repaired = shapely.make_valid(geoms[repairable])
+            for i in np.flatnonzero(shapely.get_type_id(repaired) == shapely.GeometryType.GEOMETRYCOLLECTION):
+                repaired[i] = self._polygonal_part(repaired[i])
+            geoms = geoms.copy()
+            geoms[repairable] = repaired
+            self.gdf['geometry'] = gpd.GeoSeries(geoms, index=self.gdf.index, crs=self.gdf.crs)
+            self.gdf.loc[repairable, '_area'] = shapely.area(repaired)
+            self.log_step("Repair invalid geometries", 0, len(self.gdf),
+                         f"Repaired {repair_count} invalid polygons with make_valid")
+        
+        # Check for geometries still invalid after the repair in one vectorised GEOS pass
+        invalid_mask = pd.Series(~self._valid_polygons(geoms), index=self.gdf.index)
         invalid_count = invalid_mask.sum()
         
         print(f"Invalid geometries found: {invalid_count}")
         
         if invalid_count > 0:
             # Show examples of invalid geometries
-            invalid_examples = self.gdf[invalid_mask][['COUNTRY', 'BPL_NAME', 'SMALLEST']].head(5)
+            invalid_examples = self.gdf.loc[invalid_mask, ['COUNTRY', 'BPL_NAME', 'SMALLEST', 'geometry']].head(5)
+            invalid_examples = pd.DataFrame(invalid_examples.drop(columns='geometry')).assign(
+                TYPE=invalid_examples.geometry.geom_type.fillna('None').to_numpy()
+            )
             print("Examples of invalid geometries:")
-            for idx, row in invalid_examples.iterrows():
-                geom = self.gdf.loc[idx, 'geometry']
-                geom_type = type(geom).__name__ if geom is not None else "None"
-                print(f"  {row['COUNTRY']} - {row['BPL_NAME']} (Type: {geom_type})")
+            print(invalid_examples.to_string(index=False))
             
             # Remove invalid geometries
-            self.gdf = self.gdf[~invalid_mask].copy()
+            self.gdf = self.gdf[~invalid_mask]
             self.log_step("Remove invalid geometries", invalid_count, len(self.gdf), 
-                         "Non-polygon or invalid geometries")
+                         "Non-polygon geometries or invalid ones make_valid could not repair")
         else:
             print("No invalid geometries found")
     
@@ -704,8 +822,11 @@ class SSAShapefileCleaner:
         
         # Basic counts
         total = len(self.gdf)
-        valid_geoms = self.gdf.geometry.notna().sum()
-        valid_smallest = self.gdf['SMALLEST'].notna().sum()
+        # Null masks are computed once and reused by the checks below
+        geom_notna = self.gdf.geometry.notna().to_numpy()
+        smallest_notna = self.gdf['SMALLEST'].notna().to_numpy()
+        valid_geoms = int(geom_notna.sum())
+        valid_smallest = int(smallest_notna.sum())
 
         print(f"Final dataset summary:")
         print(f"  Total records: {total:,}")
@@ -713,29 +834,23 @@ class SSAShapefileCleaner:
         print(f"  Valid SMALLEST: {valid_smallest:,} ({valid_smallest/total*100:.1f}%)")
         
         # Check for remaining issues
-        null_geoms = self.gdf.geometry.isnull().sum()
+        null_geoms = total - valid_geoms
         if null_geoms > 0:
             print(f"  ⚠️  WARNING: {null_geoms} null geometries remain")
         else:
             print(f"  ✓ No null geometries")
         
         # Check country code consistency
-        complete_data = self.gdf[(self.gdf['COUNTRY'].notna()) & 
-                               (self.gdf['CNTRY_CD'].notna()) & 
-                               (self.gdf['SMALLEST'].notna())].copy()
+        code_columns = self.gdf[['COUNTRY', 'CNTRY_CD', 'SMALLEST']]
+        complete_data = code_columns[code_columns.notna().all(axis=1)]
         
         if len(complete_data) > 0:
-            complete_data['SMALLEST_str'] = complete_data['SMALLEST'].astype(str)
-            complete_data['CNTRY_CD_str'] = complete_data['CNTRY_CD'].astype(str)
-            
-            consistent = complete_data.apply(
-                lambda row: str(row['SMALLEST_str']).startswith(str(row['CNTRY_CD_str'])), axis=1
-            ).sum()
+            consistent = self._country_code_matches(complete_data).sum()
             
             print(f"  Country code consistency: {consistent}/{len(complete_data)} ({consistent/len(complete_data)*100:.1f}%)")
         
         # Calculate readiness for climate analysis
-        usable = self.gdf[(self.gdf.geometry.notna()) & (self.gdf['SMALLEST'].notna())].shape[0]
+        usable = int((geom_notna & smallest_notna).sum())
         print(f"  Climate analysis ready: {usable:,} ({usable/total*100:.1f}%)")
         
         self.cleaning_log['final_count'] = total
@@ -749,8 +864,19 @@ class SSAShapefileCleaner:
         print("-" * 30)
         
         try:
-            self.gdf.to_file(self.output_path)  
+            # _area is a working column only; keep the output schema unchanged
+            output = self.gdf.drop(columns='_area', errors='ignore')
+            parquet_path = self.output_path.replace('.shp', '.parquet')
+            # The shapefile (via pyogrio) and a GeoParquet copy for faster re-reads are written side by side
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                writes = [
+                    executor.submit(output.to_file, self.output_path, engine="pyogrio", driver="ESRI Shapefile"),
+                    executor.submit(output.to_parquet, parquet_path),
+                ]
+                for write in writes:
+                    write.result()
             print(f"✓ Cleaned shapefile saved to: {self.output_path}")  
+            print(f"✓ GeoParquet copy saved to: {parquet_path}")
             print(f"✓ Final record count: {len(self.gdf):,}")
             return True
         except Exception as e:
@@ -759,48 +885,41 @@ class SSAShapefileCleaner:
     
     def generate_cleaning_report(self):
         """Generate cleaning summary report"""
-        print(f"\nCLEANING SUMMARY REPORT")
-        print("=" * 30)
+        print()
         
         original = self.cleaning_log['original_count']
         final = self.cleaning_log['final_count']
         total_removed = original - final
         
-        print(f"Original records: {original:,}")
-        print(f"Final records: {final:,}")
-        print(f"Total removed: {total_removed:,} ({total_removed/original*100:.1f}%)")
-        print(f"Retention rate: {final/original*100:.1f}%")
-        
-        print(f"\nDetailed cleaning steps:")
+        # Build the report once; the same text goes to the console and to the report file
+        buf = io.StringIO()
+        buf.write("SSA SHAPEFILE CLEANING REPORT\n")
+        buf.write("=" * 35 + "\n")
+        buf.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        buf.write(f"Input: {self.input_path}\n")
+        buf.write(f"Output: {self.output_path}\n\n")
+        
+        buf.write(f"SUMMARY\n")
+        buf.write("-" * 10 + "\n")
+        buf.write(f"Original records: {original:,}\n")
+        buf.write(f"Final records: {final:,}\n")
+        buf.write(f"Total removed: {total_removed:,} ({total_removed/original*100:.1f}%)\n")
+        buf.write(f"Retention rate: {final/original*100:.1f}%\n\n")
+        
+        buf.write(f"CLEANING STEPS\n")
+        buf.write("-" * 15 + "\n")
         for step in self.cleaning_log['steps']:
-            print(f"  • {step['step']}: removed {step['removed']:,}")
+            buf.write(f"• {step['step']}: removed {step['removed']:,}\n")
             if step['details']:
-                print(f"    ({step['details']})")
+                buf.write(f"  Details: {step['details']}\n")
+        report = buf.getvalue()
+        sys.stdout.write(report)
         
         # Save report to text file
         report_path = self.output_path.replace('data/derived/shapefiles/cleaned_ssa_boundaries.shp', 'data/documentation/shapefile-cleaning/ssa-shapefile-cleaning-report.txt')
         try:
             with open(report_path, 'w') as f:
-                f.write("SSA SHAPEFILE CLEANING REPORT\n")
-                f.write("=" * 35 + "\n")
-                f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Input: {self.input_path}\n")
-                f.write(f"Output: {self.output_path}\n\n")
-                
-                f.write(f"SUMMARY\n")
-                f.write("-" * 10 + "\n")
-                f.write(f"Original records: {original:,}\n")
-                f.write(f"Final records: {final:,}\n")
-                f.write(f"Total removed: {total_removed:,} ({total_removed/original*100:.1f}%)\n")
-                f.write(f"Retention rate: {final/original*100:.1f}%\n\n")
-                
-                f.write(f"CLEANING STEPS\n")
-                f.write("-" * 15 + "\n")
-                for step in self.cleaning_log['steps']:
-                    f.write(f"• {step['step']}: removed {step['removed']:,}\n")
-                    if step['details']:
-                        f.write(f"  Details: {step['details']}\n")
-                
+                f.write(report)
             print(f"✓ Cleaning report saved to: {report_path}")
         except Exception as e:
             print(f"⚠️  Could not save cleaning report: {e}")
@@ -822,89 +941,51 @@ class SSAShapefileCleaner:
         print(f"\nGENERATING UNIQUE SMALLEST UNITS LATEX TABLE")
         print("=" * 45)
         
-        # Filter for valid SMALLEST values
-        valid_data = self.gdf[self.gdf['SMALLEST'].notna()].copy()
-        
-        # Group by country and calculate statistics
-        country_stats = []
-        
-        for country in sorted(valid_data['COUNTRY'].unique()):
-            country_data = valid_data[valid_data['COUNTRY'] == country]
-            
-            # Get unique SMALLEST values for this country
-            unique_smallest = country_data['SMALLEST'].unique()
-            total_unique = len(unique_smallest)
-            
-            # For each unique SMALLEST, determine its classification
-            # We'll take the first occurrence of each SMALLEST to check GEOLEV values
-            geolev2_count = 0
-            geolev1_only_count = 0
-            neither_count = 0
-            
-            for smallest_val in unique_smallest:
-                # Get first row for this SMALLEST value
-                smallest_row = country_data[country_data['SMALLEST'] == smallest_val].iloc[0]
-                
-                has_geolev2 = pd.notna(smallest_row['GEOLEV2'])
-                has_geolev1 = pd.notna(smallest_row['GEOLEV1'])
-                
-                if has_geolev2:
-                    geolev2_count += 1
-                elif has_geolev1:  # has GEOLEV1 but not GEOLEV2
-                    geolev1_only_count += 1
-                else:  # has neither
-                    neither_count += 1
-            
-            # Verify columns sum correctly
-            calculated_total = geolev2_count + geolev1_only_count + neither_count
-            if calculated_total != total_unique:
-                print(f"⚠️  WARNING: Mismatch for {country}: {calculated_total} != {total_unique}")
-            
-            country_stats.append({
-                'country': country,
-                'total': total_unique,
-                'geolev2': geolev2_count,
-                'geolev1': geolev1_only_count,
-                'neither': neither_count
-            })
-        
-        # Create LaTeX table
-        latex_lines = []
-        latex_lines.append("\\begin{tabular}{lrrrr}")
-        latex_lines.append("\\toprule")
-        latex_lines.append("Country & \# SMALLEST & GEOLEV2 & GEOLEV1 & COUNTRY \\\\")
-        latex_lines.append("    & (1) & (2) & (3) & (4) \\\\")
-        latex_lines.append("\\midrule")
-        
-        # Add data rows
-        for stats in country_stats:
-            latex_lines.append(
-                f"{stats['country']} & "
-                f"{stats['total']:,} & "
-                f"{stats['geolev2']:,} & "
-                f"{stats['geolev1']:,} & "
-                f"{stats['neither']:,} \\\\"
-            )
-        
-        # Add total row
-        total_all = sum(s['total'] for s in country_stats)
-        total_geolev2 = sum(s['geolev2'] for s in country_stats)
-        total_geolev1 = sum(s['geolev1'] for s in country_stats)
-        total_neither = sum(s['neither'] for s in country_stats)
-        
-        latex_lines.append("\\midrule")
-        latex_lines.append(
-            f"\\textbf{{Total}} & "
-            f"\\textbf{{{total_all:,}}} & "
-            f"\\textbf{{{total_geolev2:,}}} & "
-            f"\\textbf{{{total_geolev1:,}}} & "
-            f"\\textbf{{{total_neither:,}}} \\\\"
+        # One row per unique SMALLEST unit within each country; the first occurrence decides its classification
+        valid_data = self.gdf.loc[self.gdf['SMALLEST'].notna(), ['COUNTRY', 'SMALLEST', 'GEOLEV1', 'GEOLEV2']]
+        unique_units = valid_data.drop_duplicates(['COUNTRY', 'SMALLEST'])
+        level = np.select(
+            [unique_units['GEOLEV2'].notna(), unique_units['GEOLEV1'].notna()],
+            ['geolev2', 'geolev1'],  # GEOLEV1 only counts units without GEOLEV2
+            default='neither'
         )
         
-        latex_lines.append("\\bottomrule")
-        latex_lines.append("\\end{tabular}")
+        # Count units per country and classification in one groupby
+        country_stats = (
+            unique_units.groupby([unique_units['COUNTRY'], level], observed=True)
+            .size()
+            .unstack(fill_value=0)
+            .reindex(columns=['geolev2', 'geolev1', 'neither'], fill_value=0)
+            .sort_index()
+        )
+        country_stats.insert(0, 'total', country_stats.sum(axis=1))
         
-        latex_table = "\n".join(latex_lines)
+        # Create LaTeX table
+        header = [
+            "\\begin{tabular}{lrrrr}",
+            "\\toprule",
+            "Country & \# SMALLEST & GEOLEV2 & GEOLEV1 & COUNTRY \\\\",
+            "    & (1) & (2) & (3) & (4) \\\\",
+            "\\midrule",
+        ]
+
+        # Data rows
+        rows = [
+            f"{country} & {total:,} & {geolev2:,} & {geolev1:,} & {neither:,} \\\\"
+            for country, total, geolev2, geolev1, neither in country_stats.itertuples()
+        ]
+
+        # Total row
+        total_all, total_geolev2, total_geolev1, total_neither = country_stats.sum().tolist()
+        footer = [
+            "\\midrule",
+            f"\\textbf{{Total}} & \\textbf{{{total_all:,}}} & \\textbf{{{total_geolev2:,}}} & "
+            f"\\textbf{{{total_geolev1:,}}} & \\textbf{{{total_neither:,}}} \\\\",
+            "\\bottomrule",
+            "\\end{tabular}",
+        ]
+
+        latex_table = "\n".join(header + rows + footer)
         
         # Save to file
         table_path = self.overleaf_path
@@ -924,9 +1005,9 @@ class SSAShapefileCleaner:
             print("-" * 70)
             print(f"{'Country':<20} {'Total':<10} {'GEOLEV2':<10} {'GEOLEV1':<10} {'Neither':<10}")
             print("-" * 70)
-            for stats in country_stats:
-                print(f"{stats['country']:<20} {stats['total']:<10,} {stats['geolev2']:<10,} "
-                    f"{stats['geolev1']:<10,} {stats['neither']:<10,}")
+            for country, total, geolev2, geolev1, neither in country_stats.itertuples():
+                print(f"{country:<20} {total:<10,} {geolev2:<10,} "
+                    f"{geolev1:<10,} {neither:<10,}")
             print("-" * 70)
             print(f"{'TOTAL':<20} {total_all:<10,} {total_geolev2:<10,} "
                 f"{total_geolev1:<10,} {total_neither:<10,}")
@@ -1,21 +1,37 @@
 # --------------------------------------------------------
 # PROJECT :         Climate Change and Fertility in SSA
-# PURPOSE:          Download ERA5 climate data using multiple API keys and threading
+# PURPOSE:          Download ERA5 climate data using multiple API keys and asyncio
 # AUTHOR:           Prayog Bhattarai
 # DATE MODIFIED:    09 October 2025
-# DESCRIPTION:      This script uses the Climate Data Store (CDS) API to download ERA5 climate data
-#                   for specified years and geographical coordinates. It employs threading to handle
-#                   multiple API keys for parallel downloads, improving efficiency and reducing wait times.
+# DESCRIPTION:      This script uses the Climate Data Store (CDS) REST API to download ERA5 climate data
+#                   for specified years and geographical coordinates. A single asyncio event loop drives
+#                   several in-flight jobs per API key (submit, poll, download), so long CDS queue waits
+#                   overlap with each other instead of each blocking a thread.
+#                   Each year is requested as 12 monthly jobs per variable, which CDS schedules in parallel,
+#                   and the monthly files are merged back into one file per year once all downloads finish.
+#                   Data is requested as GRIB, which is much smaller on the wire than CDS's NetCDF
+#                   repack, and converted to NetCDF locally while other months download.
 # OUTPUT:           NetCDF files for the whole of Africa for each year, downloaded to the specified folder.
-#                   
+#
 # Notes: Make sure to replace the placeholder API keys with your actual keys. Also define the folder path to save the downloaded data.
+#        Set CDS_SCRATCH to a folder on a fast local disk (outside Dropbox) to control where downloads are staged.
 # --------------------------------------------------------
 
 # Import necessary libraries
 import os
-import cdsapi
-from queue import Queue, Empty
-import threading
+import json
+import time
+import asyncio
+import logging
+import random
+import shutil
+import sqlite3
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import aiohttp
+import aiofiles
+import xarray as xr
+import cfgrib
 
 # Define constants
 coordinates = {
@@ -25,77 +41,418 @@ coordinates = {
 default_folder_path = os.path.expanduser("~/Climate_Change_and_Fertility_in_SSA")
 CF_DIR = os.environ.get("CF_DIR", default_folder_path)
 folder_path = f"{CF_DIR}/data/source/era/continent"
+# Downloads and merges happen in a local scratch folder; only finished yearly files are moved
+# into folder_path, so a Dropbox-synced target never uploads partial or monthly files
+scratch_path = os.environ.get("CDS_SCRATCH", os.path.join(tempfile.gettempdir(), "cds_scratch"))
 
-# Define a single worker function for downloading data
-def worker(api_key, country, queue):
+# CDS REST API settings
+CDS_URL = "https://cds.climate.copernicus.eu/api"
+DATASET = "reanalysis-era5-single-levels"
+JOBS_PER_KEY = 4            # CDS jobs held in flight per API key
+CHUNK_SIZE = 1 << 20        # 1 MiB download chunks
+WRITE_SIZE = 16 << 20       # chunks are coalesced into 16 MiB writes
+RANGE_PARTS = 8             # parallel byte-range requests per result file
+RANGE_MIN_SIZE = 64 << 20   # results smaller than this are fetched in one stream
+REST_TIMEOUT = aiohttp.ClientTimeout(total=60, sock_connect=15)
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=15, sock_read=300)  # a stalled stream fails instead of hanging
+POLL_INITIAL_DELAY = 5      # seconds before the first status check
+POLL_MAX_DELAY = 120        # cap on the exponential poll backoff
+REST_RETRIES = 5            # retries for submit/poll calls hitting a transient gateway error
+REST_BACKOFF = 1            # seconds, doubled on each retry
+RETRY_STATUSES = {429, 502, 503, 504}
+MAX_ATTEMPTS = 5            # download attempts per month before giving up
+RETRY_BASE_DELAY = 2        # seconds, doubled after each failed attempt
+RETRY_MAX_DELAY = 600       # cap on the retry backoff
+CONVERT_WORKERS = min(4, os.cpu_count() or 1)  # processes decoding GRIB results
+KEY_MAX_FAILURES = 3        # consecutive CDS failures before an API key is taken out of rotation
+MIN_FILE_SIZE = 10_000_000  # bytes; smaller yearly files are treated as incomplete
+NC_CHUNKS = {"valid_time": 24, "latitude": 100, "longitude": 100}  # HDF5 chunk shape of the yearly files
+NC_COMPLEVEL = 5            # zlib level for the yearly files
+
+# Each variable is requested as its own job so CDS can schedule them on separate workers
+VARIABLES = ("2m_temperature", "total_precipitation")
+
+log = logging.getLogger("cds")
+
+# Log one pipeline event as a JSON line; t is a perf_counter timestamp so stage durations can be diffed afterwards,
+# e.g. pandas.read_json(f"{scratch_path}/cds_log.jsonl", lines=True)
+def log_event(event, **fields):
+    log.info(json.dumps({"event": event, "t": round(time.perf_counter(), 3), **fields}))
+
+# Request fields that are the same for every job (CDS skips days that do not exist in a month)
+REQUEST_TEMPLATE = {
+    "product_type": ["reanalysis"],
+    "day": [f"{d:02d}" for d in range(1, 32)],
+    "time": [f"{h:02d}:00" for h in range(24)],
+    "data_format": "grib",
+    "download_format": "unarchived",
+}
+
+# Build the CDS request for one country-year-month-variable; a shallow copy is enough since the request is serialised straight away
+def build_request(country, year, month, variable):
     coords = coordinates[country]
-    c = cdsapi.Client(url="https://cds.climate.copernicus.eu/api", key = api_key)
-    dataset = "reanalysis-era5-single-levels"
+    request = REQUEST_TEMPLATE.copy()
+    request["variable"] = [variable]
+    request["year"] = [str(year)]
+    request["month"] = [f"{month:02d}"]
+    request["area"] = [coords["north"], coords["west"], coords["south"], coords["east"]]
+    return request
 
+# Seconds the server asked us to wait (Retry-After), or None
+def retry_after(headers):
+    value = headers.get("Retry-After") if headers else None
+    return int(value) if value and value.isdigit() else None
+
+# Issue a small JSON request to CDS, retrying transient gateway and rate-limit errors
+async def cds_json(session, method, url, api_key, **kwargs):
+    for attempt in range(REST_RETRIES + 1):
+        async with session.request(method, url, headers={"PRIVATE-TOKEN": api_key}, timeout=REST_TIMEOUT, **kwargs) as resp:
+            if resp.status in RETRY_STATUSES and attempt < REST_RETRIES:
+                await asyncio.sleep(retry_after(resp.headers) or REST_BACKOFF * 2 ** attempt)
+                continue
+            resp.raise_for_status()
+            return await resp.json()
+
+# Submit a request to CDS and return the URL of the created job
+async def submit(session, api_key, request):
+    url = f"{CDS_URL}/retrieve/v1/processes/{DATASET}/execute"
+    job = await cds_json(session, "POST", url, api_key, json={"inputs": request})
+    return f"{CDS_URL}/retrieve/v1/jobs/{job['jobID']}"
+
+# Poll a CDS job with exponential backoff until it succeeds, then return the result href
+async def poll(session, api_key, job_url):
+    delay = POLL_INITIAL_DELAY
     while True:
-        try:
-            year = queue.get_nowait()
-        except Empty:
+        status = (await cds_json(session, "GET", job_url, api_key))["status"]
+        if status == "successful":
             break
-                
+        if status in ("failed", "rejected", "dismissed"):
+            raise RuntimeError(f"CDS job {job_url} finished with status '{status}'")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, POLL_MAX_DELAY)
+
+    results = await cds_json(session, "GET", f"{job_url}/results", api_key)
+    return results["asset"]["value"]["href"]
+
+# Open result files for sequential writing; O_SEQUENTIAL (Windows only) tunes the cache manager for large streamed writes
+def sequential_opener(path, flags):
+    return os.open(path, flags | getattr(os, "O_BINARY", 0) | getattr(os, "O_SEQUENTIAL", 0), 0o666)
+
+# Stream the finished NetCDF (or one byte range of it) to disk in fixed-size chunks
+async def download_stream(session, href, path, start=None, end=None):
+    headers = {"Range": f"bytes={start}-{end}"} if start is not None else None
+    async with session.get(href, headers=headers, timeout=DOWNLOAD_TIMEOUT) as resp:
+        resp.raise_for_status()
+        if headers and resp.status != 206:
+            raise RuntimeError(f"Server ignored range request for {href}")
+        # The socket often hands back less than CHUNK_SIZE at a time, so collect chunks into
+        # WRITE_SIZE blocks and write those unbuffered: one syscall and one thread hop per block
+        mode = "r+b" if headers else "wb"
+        buffer = bytearray()
+        async with aiofiles.open(path, mode, buffering=0, opener=sequential_opener) as f:
+            if headers:
+                await f.seek(start)
+            async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                buffer += chunk
+                if len(buffer) >= WRITE_SIZE:
+                    await f.write(buffer)
+                    buffer.clear()
+            if buffer:
+                await f.write(buffer)
+
+# Download a result, splitting large files into RANGE_PARTS parallel byte-range requests
+async def download(session, href, path):
+    async with session.head(href, timeout=DOWNLOAD_TIMEOUT, allow_redirects=True) as resp:
+        resp.raise_for_status()
+        size = int(resp.headers.get("Content-Length", 0))
+        ranged = resp.headers.get("Accept-Ranges") == "bytes"
+
+    if not ranged or size < RANGE_MIN_SIZE:
+        await download_stream(session, href, path)
+        return
+
+    # A single TCP stream rarely fills a long-haul link; several ranges written
+    # at their own offsets into a pre-sized file do
+    with open(path, "wb") as f:
+        f.truncate(size)
+    part_size = -(-size // RANGE_PARTS)
+    tasks = [
+        asyncio.create_task(download_stream(session, href, path, start, min(start + part_size, size) - 1))
+        for start in range(0, size, part_size)
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # Stop the surviving ranges before the retry reopens the file, and keep the first error
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+# Track CDS job handles on disk so an interrupted run can re-attach to jobs instead of resubmitting them
+def open_state_db(path):
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS jobs("
+        "country TEXT, year INT, month INT, variable TEXT, job_url TEXT, api_key TEXT, state TEXT, "
+        "PRIMARY KEY (country, year, month, variable))"
+    )
+    return conn
+
+def save_job(conn, country, year, month, variable, job_url, api_key, state):
+    conn.execute(
+        "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (country, year, month, variable, job_url, api_key, state),
+    )
+
+# Return (job_url, api_key) of a job submitted by an earlier run that has not been downloaded yet
+def load_pending_job(conn, country, year, month, variable):
+    return conn.execute(
+        "SELECT job_url, api_key FROM jobs "
+        "WHERE country = ? AND year = ? AND month = ? AND variable = ? AND state IN ('submitted', 'ready')",
+        (country, year, month, variable),
+    ).fetchone()
+
+# Submit a single country-year-month-variable (unless resuming a known job) and wait until CDS has the result ready
+async def request_result(session, conn, api_key, country, year, month, variable, job_url=None):
+    task = {"year": year, "month": month, "variable": variable, "key": api_key[-4:]}
+    if job_url is None:
+        log_event("submit", **task)
+        job_url = await submit(session, api_key, build_request(country, year, month, variable))
+        save_job(conn, country, year, month, variable, job_url, api_key, "submitted")
+    else:
+        log_event("resume", **task)
+    href = await poll(session, api_key, job_url)
+    save_job(conn, country, year, month, variable, job_url, api_key, "ready")
+    log_event("ready", **task)
+    return job_url, href
+
+# Pool of CDS slots shared by all tasks: each key contributes JOBS_PER_KEY tokens, and a task
+# takes whichever token frees up first, so a backed-up key never holds work another key could run
+class KeyPool:
+    def __init__(self, api_keys):
+        self.failures = {key: 0 for key in api_keys}
+        self.free = asyncio.Queue()
+        for _ in range(JOBS_PER_KEY):
+            for key in api_keys:
+                self.free.put_nowait(key)
+
+    def alive(self, key):
+        return self.failures[key] < KEY_MAX_FAILURES
+
+    async def acquire(self):
+        while True:
+            key = await self.free.get()
+            if key is None:
+                # Every key is disabled; pass the marker on so other waiting tasks wake up too
+                self.free.put_nowait(None)
+                raise RuntimeError("All API keys have been disabled after repeated failures")
+            if self.alive(key):
+                return key
+            # Tokens of disabled keys are dropped instead of being handed out again
+
+    def release(self, key):
+        self.free.put_nowait(key)
+
+    # Count consecutive CDS-side failures; keys that keep failing (revoked, over quota) leave the pool
+    def record(self, key, ok):
+        if ok:
+            self.failures[key] = 0
+            return
+        self.failures[key] += 1
+        if self.failures[key] == KEY_MAX_FAILURES:
+            log_event("key_disabled", key=key[-4:], failures=KEY_MAX_FAILURES)
+            if not any(self.alive(k) for k in self.failures):
+                self.free.put_nowait(None)
+
+# Submit (or re-attach to) the CDS job for one task and wait for its result; returns (api_key, job_url, href)
+async def pooled_request(session, conn, pool, country, year, month, variable, pending):
+    if pending and pool.alive(pending[1]):
+        # The job is already queued at CDS under its original key, so re-attaching does not take a new slot
+        job_url, api_key = pending
         try:
-            print(f"Downloading {country} {year} with key {api_key[-4:]}")
-            request = {
-                "product_type": "reanalysis",
-                "variable": [
-                    "2m_temperature",
-                    "total_precipitation"
-                ],
-                "year": [str(year)],
-                "month": ["01", "02", "03", "04", "05", "06", "07",
-                         "08", "09", "10", "11", "12"],
-                "day": ["01", "02", "03", "04", "05", "06", "07",
-                       "08", "09", "10", "11", "12", "13", "14",
-                       "15", "16", "17", "18", "19", "20", "21",
-                       "22", "23", "24", "25", "26", "27", "28",
-                       "29", "30", "31"],
-                "time": ["00:00", "01:00", "02:00", "03:00",
-                        "04:00", "05:00", "06:00", "07:00",
-                        "08:00", "09:00", "10:00", "11:00",
-                        "12:00", "13:00", "14:00", "15:00",
-                        "16:00", "17:00", "18:00", "19:00",
-                        "20:00", "21:00", "22:00", "23:00"],
-                "format": "netcdf",
-                "area": [coords["north"], coords["west"], coords["south"], coords["east"]]
-            }
-            c.retrieve(dataset, request, f"{folder_path}/{country}_{year}.nc")
+            job_url, href = await request_result(session, conn, api_key, country, year, month, variable, job_url)
+        except Exception:
+            pool.record(api_key, ok=False)
+            raise
+        pool.record(api_key, ok=True)
+        return api_key, job_url, href
+
+    # The token only covers the CDS side of the job: it goes back to the pool as
+    # soon as the result is ready, so the next task is submitted while this one is
+    # still streaming to disk. Returned tokens join the back of the queue, so a
+    # retry is normally picked up by a different key than the one that just failed.
+    api_key = await pool.acquire()
+    try:
+        job_url, href = await request_result(session, conn, api_key, country, year, month, variable)
+    except Exception:
+        pool.record(api_key, ok=False)
+        raise
+    finally:
+        pool.release(api_key)
+    pool.record(api_key, ok=True)
+    return api_key, job_url, href
+
+# Retry a download with exponential backoff, taking a fresh key from the pool on every retry
+async def download_with_retry(session, conn, pool, converter, country, year, month, variable):
+    path = f"{scratch_path}/{country}_{year}_{month:02d}_{variable}.nc"
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        pending = load_pending_job(conn, country, year, month, variable) if attempt == 1 else None
+        # A failed re-attach must still mark the pending job as failed, or every later run resumes the same dead job
+        job_url, api_key = pending if pending else (None, None)
+        try:
+            api_key, job_url, href = await pooled_request(session, conn, pool, country, year, month, variable, pending)
+            await download(session, href, f"{path}.grib")
+            log_event("downloaded", year=year, month=month, variable=variable, bytes=os.path.getsize(f"{path}.grib"))
+            # GRIB decoding is CPU-bound and holds the GIL, so it runs in a separate process
+            # and overlaps with the other months' downloads without slowing the event loop
+            await asyncio.get_running_loop().run_in_executor(converter, grib_to_netcdf, f"{path}.grib", f"{path}.part")
+            os.replace(f"{path}.part", path)
+            os.remove(f"{path}.grib")
+            log_event("converted", year=year, month=month, variable=variable, bytes=os.path.getsize(path))
+            save_job(conn, country, year, month, variable, job_url, api_key, "completed")
+            return
         except Exception as e:
-            print(f"Failed to download {year}: {e}")
-            queue.put(year)
-        finally:
-            queue.task_done()
+            if job_url is not None:
+                save_job(conn, country, year, month, variable, job_url, api_key, "failed")
+            if attempt == MAX_ATTEMPTS:
+                raise
+            # Honour Retry-After when CDS sends one; otherwise back off exponentially with
+            # jitter so months that failed together do not all hit CDS again at once
+            delay = retry_after(getattr(e, "headers", None))
+            if delay is None:
+                delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) + random.uniform(0, 5)
+            log_event("retry", year=year, month=month, variable=variable, attempt=attempt, delay=round(delay), error=str(e))
+        # Back off without holding a token so the pool can serve other months meanwhile
+        await asyncio.sleep(delay)
+
+# Spread tasks over the pooled API keys, at most JOBS_PER_KEY in flight per key, over one shared keep-alive HTTP session
+async def download_all(country, tasks, api_keys, conn):
+    pool = KeyPool(api_keys)
 
-# Main workflow function to set up threading and initiate downloads        
+    # Every key talks to the same host and authenticates per request, so one
+    # connection pool serves all workers and submit/poll/download calls reuse
+    # open TLS connections instead of handshaking each time.
+    connector = aiohttp.TCPConnector(limit_per_host=16, keepalive_timeout=300)
+    with ProcessPoolExecutor(CONVERT_WORKERS) as converter:
+        async with aiohttp.ClientSession(connector=connector, headers={"Connection": "keep-alive"}) as session:
+            jobs = [
+                download_with_retry(session, conn, pool, converter, country, year, month, variable)
+                for year, month, variable in tasks
+            ]
+            results = await asyncio.gather(*jobs, return_exceptions=True)
+
+    failed = [(task, result) for task, result in zip(tasks, results) if isinstance(result, Exception)]
+    for (year, month, variable), error in failed:
+        log_event("failed", year=year, month=month, variable=variable, attempts=MAX_ATTEMPTS, error=str(error))
+    return failed
+
+# Convert a downloaded GRIB file to NetCDF with the same layout as CDS NetCDF output (valid_time, latitude, longitude)
+def grib_to_netcdf(grib_path, nc_path):
+    parts = []
+    for ds in cfgrib.open_datasets(grib_path, backend_kwargs={"indexpath": ""}):
+        if "step" in ds.dims:
+            # Accumulated fields (tp) are stored as forecast time x step; flatten them onto one valid_time axis
+            valid_time = ds["valid_time"].values.ravel()
+            ds = ds.drop_vars("valid_time").stack(valid_time=("time", "step"))
+            ds = ds.drop_vars(["valid_time", "time", "step"]).assign_coords(valid_time=valid_time)
+            ds = ds.dropna("valid_time", how="all")
+        else:
+            ds = ds.drop_vars("valid_time", errors="ignore").rename(time="valid_time")
+        parts.append(ds.drop_vars(["number", "surface", "step"], errors="ignore"))
+    ds = xr.merge(parts, join="outer").sortby("valid_time").transpose("valid_time", "latitude", "longitude")
+    ds.to_netcdf(nc_path)
+
+# Check whether a yearly file is already complete; corrupt files are renamed to .nc.bad so they are fetched again
+def is_downloaded(path):
+    if not os.path.exists(path) or os.path.getsize(path) < MIN_FILE_SIZE:
+        return False
+    try:
+        with xr.open_dataset(path, decode_times=False) as ds:
+            if {"t2m", "tp"} <= set(ds.data_vars):
+                return True
+    except Exception as e:
+        log_event("unreadable", path=path, error=str(e))
+    log_event("incomplete", path=path, renamed_to=f"{path}.bad")
+    os.replace(path, f"{path}.bad")
+    return False
+
+# Chunked zlib + shuffle encoding for every variable; chunks are clipped to the dimension sizes
+def compressed_encoding(ds):
+    return {
+        name: {
+            "zlib": True,
+            "complevel": NC_COMPLEVEL,
+            "shuffle": True,
+            "chunksizes": tuple(min(NC_CHUNKS.get(dim, size), size) for dim, size in zip(var.dims, var.shape)),
+        }
+        for name, var in ds.data_vars.items()
+    }
+
+# Combine the monthly files of each year (12 months x each variable) into a single yearly file
+def merge_monthly_files(country, years):
+    for year in years:
+        monthly_files = [
+            f"{scratch_path}/{country}_{year}_{month:02d}_{variable}.nc"
+            for month in range(1, 13)
+            for variable in VARIABLES
+        ]
+        missing = [path for path in monthly_files if not os.path.exists(path)]
+        if missing:
+            log_event("merge_skipped", year=year, missing=len(missing))
+            continue
+
+        yearly_file = f"{scratch_path}/{country}_{year}.nc"
+        # Compressing here, on local scratch, roughly halves what Dropbox then has to upload
+        with xr.open_mfdataset(monthly_files, combine="by_coords") as ds:
+            ds.to_netcdf(yearly_file, encoding=compressed_encoding(ds))
+        # Scratch and folder_path are usually different filesystems, so shutil.move copies; copy under a
+        # .part name and rename so an interrupted run never leaves a truncated yearly file in place
+        shutil.move(yearly_file, f"{folder_path}/{country}_{year}.nc.part")
+        os.replace(f"{folder_path}/{country}_{year}.nc.part", f"{folder_path}/{country}_{year}.nc")
+        for path in monthly_files:
+            os.remove(path)
+        log_event("merged", year=year, bytes=os.path.getsize(f"{folder_path}/{country}_{year}.nc"))
+
+# Main workflow function to set up the event loop and initiate downloads
 def main():
     country = "Africa"
     years = list(range(2020, 2024))
-    queue = Queue()
-    for year in years:
-        queue.put(year)
     api_keys = [
         # enter API keys here.
         "01bef106-fa50-4249-a6d1-c551a74857a4",
         "d051299d-2f34-4039-8ad9-9d210502f5ca"
     ]
 
-    threads = []
-    for key in api_keys:
-        thread = threading.Thread(target = worker, args = (key, country, queue))
-        thread.start()
-        threads.append(thread)
+    os.makedirs(scratch_path, exist_ok=True)
+    # Events go to the console and are appended to a JSON-lines file for later timing analysis. The file handler
+    # sits on the "cds" logger only, and it does not propagate, so library warnings never end up in the JSONL file
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    log.setLevel(logging.INFO)
+    log.addHandler(logging.StreamHandler())
+    log.addHandler(logging.FileHandler(os.path.join(scratch_path, "cds_log.jsonl")))
+    log.propagate = False
 
-    queue.join()
+    # Skip years already in place and months already sitting in scratch from an earlier run
+    pending_years = [year for year in years if not is_downloaded(f"{folder_path}/{country}_{year}.nc")]
+    tasks = [
+        (year, month, variable)
+        for year in pending_years
+        for month in range(1, 13)
+        for variable in VARIABLES
+        if not os.path.exists(f"{scratch_path}/{country}_{year}_{month:02d}_{variable}.nc")
+    ]
+    log_event("start", years_done=len(years) - len(pending_years), tasks=len(tasks))
 
-    for thread in threads:
-        thread.join()
+    conn = open_state_db(os.path.join(scratch_path, "cds_jobs.db"))
+    try:
+        asyncio.run(download_all(country, tasks, api_keys, conn))
+    finally:
+        conn.close()
+    merge_monthly_files(country, pending_years)
 
-    print("All downloads completed.")
+    log_event("finished")
 
 # Running the main function
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -18,19 +18,38 @@
 
 # Import necessary libraries
 import os
-import pandas as pd
+import shutil
 import xarray as xr
+import dask
+# With flox installed, xarray runs the daily resample reductions as a single pass over integer group codes;
+# bottleneck supplies the C NaN-skipping mean/max kernels for in-memory arrays
+xr.set_options(use_flox=True, use_bottleneck=True)
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import zarr
 from glob import glob
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 
 # Set up base directories
 BASE_DIR = "D:/prayog/NUS Dropbox/Prayog Bhattarai/Climate_Change_and_Fertility_in_SSA"
 DATA_DIR = os.path.join(BASE_DIR, "data")
 INPUT_DIR = os.path.join(DATA_DIR, "source", "era", "continent")
-TEMP_ZIP_DIR = os.path.join(DATA_DIR, "temp_zip")
 OUTPUT_DIR = os.path.join(DATA_DIR, "derived", "era")
 
+# ERA5 auxiliary variables (ensemble member, experiment version) that are never used; not reading them also
+# keeps open_mfdataset from concatenating the per-hour expver strings across files
+ERA5_DROP_VARIABLES = ['number', 'expver']
+
+# Dask chunking of the hourly input; 720 hours is a whole number of days, so daily resampling never splits a chunk
+ERA5_CHUNKS = {"valid_time": 720, "latitude": 200, "longitude": 200}
+
+# The yearly netCDFs are converted once into a single Zarr store that later runs open directly.
+# Its chunks are smaller in space than the netCDF ones (~12MB each), so a country's bounding box reads little beyond itself
+ZARR_STORE = os.path.join(DATA_DIR, "derived", "era_zarr", "Africa.zarr")
+ZARR_CHUNKS = {"valid_time": 720, "latitude": 64, "longitude": 64}
+
 # Dictionary of countries that we need to process and their bounding boxes
 country_coordinates = {
     "Benin": {"north": 13, "south": 6.32, "east": 3.2, "west": 0.73},
@@ -60,328 +79,327 @@ country_coordinates = {
     "Togo": {"north": 11.3, "south": 6.0, "east": 1.64, "west": -0.15},
 }
 
-# Create the temporary directory if it doesn't exist
-os.makedirs(TEMP_ZIP_DIR, exist_ok = True)
+# Parquet output settings: zstd is about as fast as snappy to write but smaller, and the
+# grid coordinates repeat every day so they are dictionary-encoded
+PARQUET_COMPRESSION = 'zstd'
+PARQUET_COMPRESSION_LEVEL = 3
+PARQUET_ROW_GROUP_SIZE = 100_000
+PARQUET_DICTIONARY_COLUMNS = ['latitude', 'longitude']
+
+# Recompute country-years whose parquet files already exist (set CF_FORCE=1)
+FORCE = os.environ.get('CF_FORCE') == '1'
+
+# Processes writing country parquet files at the same time
+COUNTRY_WORKERS = min(len(country_coordinates), os.cpu_count() or 1)
 
 # Create the output directory structure if it doesn't exist:
 for country in country_coordinates.keys():
     country_dir = os.path.join(OUTPUT_DIR, country)
     os.makedirs(country_dir, exist_ok=True)
 
-def extract_year_from_filename(file_name):
-    """
-    Extract the year from a file name.
-    
-    The file names are expected to be in the format "Africa_YYYY.nc", where YYYY is the year.
-    
-    Parameters:
-    - file_name: Name of the file (string)
-    
-    Returns:
-    - year: Extracted year as an integer
-    """
-    # Extract the base name without the directory path
-    base_name = os.path.basename(file_name)
-    
-    # Split the base name to isolate the year
-    parts = base_name.split('_')
-    if len(parts) > 1 and parts[1].isdigit():
-        return int(parts[1].split('.')[0])  # Extract the year and convert to integer
-    else:
-        raise ValueError(f"Invalid file name format: {file_name}")
 
+# Open all yearly netCDF files as one dataset
+def open_netcdf_files(nc_files):
+    """Open all years at once, lazily in dask chunks; file metadata is read in parallel."""
+    print(f"Opening {len(nc_files)} netCDF files as one dataset")
+    ds = xr.open_mfdataset(
+        nc_files, combine='by_coords', parallel=True, engine='h5netcdf', chunks=ERA5_CHUNKS,
+        drop_variables=ERA5_DROP_VARIABLES,
+    )
+    # Keep only the fields this script aggregates, so nothing else enters the dask graph
+    return ds[[name for name in ('tp', 't2m') if name in ds.data_vars]]
+
+# Fingerprint of each netCDF file, so a re-downloaded file with the same name is noticed
+def source_fingerprints(nc_files):
+    """Map each file's base name to its [size, mtime_ns]."""
+    fingerprints = {}
+    for path in nc_files:
+        stat = os.stat(path)
+        fingerprints[os.path.basename(path)] = [stat.st_size, stat.st_mtime_ns]
+    return fingerprints
+
+# Prepare a netCDF dataset for writing with the store's own chunking
+def zarr_ready(ds, stored_hours=0):
+    """
+    Drop the netCDF chunk/compression settings and rechunk to ZARR_CHUNKS.
 
-def convert_and_process_nc_files(nc_file):
+    When appending after stored_hours hours, the first time chunk only fills up the store's last, partial
+    chunk, so every dask chunk lands on whole Zarr chunks.
     """
-    Convert .nc files to zip, extract and process based on file type.
-    
-    Parameters:
-    - nc_file: Path to the .nc file
+    for name in ds.variables:
+        ds[name].encoding = {}
+    step = ZARR_CHUNKS['valid_time']
+    head = min((step - stored_hours % step) % step, ds.sizes['valid_time'])
+    rest = ds.sizes['valid_time'] - head
+    time_chunks = ((head,) if head else ()) + (step,) * (rest // step) + ((rest % step,) if rest % step else ())
+    return ds.chunk({**ZARR_CHUNKS, 'valid_time': time_chunks})
+
+# Mark the store complete or not and record the files it holds
+def set_store_attrs(source_files, complete):
+    """Update the store's attributes and re-consolidate its metadata."""
+    group = zarr.open_group(ZARR_STORE, mode='r+')
+    group.attrs.update({'source_files': source_files, 'complete': complete})
+    zarr.consolidate_metadata(ZARR_STORE)
+
+# Convert the yearly netCDF files into one consolidated Zarr store
+def convert_netcdf_to_zarr(nc_files):
     """
-    # Create a base name for the zip file (without the path and extension)
-    base_name = os.path.basename(nc_file).replace('.nc', '')
-    zip_path = os.path.join(TEMP_ZIP_DIR, f"{base_name}.zip")
-    
-    # Create a zip file
-    with zipfile.ZipFile(zip_path, 'w') as zipf:
-        zipf.write(nc_file, os.path.basename(nc_file))
-    
-    # Process the zip file
-    with zipfile.ZipFile(zip_path, 'r') as zipf:
-        # Extract all files
-        zipf.extractall(TEMP_ZIP_DIR)
-        
-        # Process each .nc file
-        for file in zipf.namelist():
-            if file.endswith('.nc'):
-                file_path = os.path.join(TEMP_ZIP_DIR, file)
-                year = extract_year_from_filename(file)
-                
-                # Process based on file suffix
-                if '_accum' in file:
-                    # Process precipitation data
-                    process_precipitation_data(file_path, country, year)
-                elif '_instant' in file:
-                    # Process temperature data
-                    process_temperature_data(file_path, country, year)
-                else:
-                    print(f"Unknown file type: {file}")
-                
-                # Clean up extracted file
-                os.remove(file_path)
-    
-    # Clean up zip file
-    os.remove(zip_path)
+    Write the netCDF inputs to ZARR_STORE, replacing any earlier store.
 
-def process_zips_to_data(zip_dir, output_base, countries):
-    """
-    Process all zip files containing netCDF data in a directory
-    and save processed parquet files to appropriate directories.
-    
-    Args:
-        INPUT_DIR (str): Path to directory containing zip files
-        OUTPUT_DIR (str): Base path for output parquet files
-        countries (dict): Country bounding boxes 
+    The fingerprints of the source files are recorded in the store's attributes, so later runs can tell
+    new and changed downloads apart.
     """
-    # Create output directory if needed
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    ds = open_netcdf_files(nc_files)
+    print(f"Converting to Zarr store {ZARR_STORE}")
+    ds = zarr_ready(ds)
+    ds.attrs = {'source_files': source_fingerprints(nc_files), 'complete': True}
+
+    # Write under a temporary name and rename, so an interrupted conversion is never opened as complete
+    os.makedirs(os.path.dirname(ZARR_STORE), exist_ok=True)
+    tmp_store = f"{ZARR_STORE}.tmp"
+    if os.path.exists(tmp_store):
+        shutil.rmtree(tmp_store)
+    ds.to_zarr(tmp_store, mode='w', consolidated=True)
+    ds.close()
+    if os.path.exists(ZARR_STORE):
+        shutil.rmtree(ZARR_STORE)
+    os.replace(tmp_store, ZARR_STORE)
 
-    # Process each zip file in zipfile directory directory
-    for zip_file in os.listdir(INPUT_DIR):
-        if not zip_file.endswith('.zip'):
-            continue
-            
-        zip_path = os.path.join(INPUT_DIR, zip_file)
-        print(f"Processing zip file: {zip_path}")
-        
-        # Use temporary directory for extraction
-        with tempfile.TemporaryDirectory() as temp_dir:
-            try:
-                # Extract zip contents
-                with zipfile.ZipFile(zip_path, 'r') as zf:
-                    zf.extractall(temp_dir)
-                
-                # Process extracted files
-                has_nc_files = False
-                for root, _, files in os.walk(temp_dir):
-                    for file in files:
-                        if file.endswith('.grib') or file.endswith('.grb') or file.endswith('.grib2'):
-                            print("This zipfile has GRIB format data. Moving on...")
-                            continue
-                        elif file.endswith('.nc'):
-                            has_nc_files = True
-                            process_nc_file(root, file, output_base, countries)
-                            
-                if not has_nc_files:
-                    print(f"No netCDF files found in {zip_file}. Moving on...")
-            except Exception as e:
-                print(f"Failed to process {zip_file}: {str(e)}")
-                continue
-
-
-
-def process_precipitation_file(nc_file, country_name, bbox, year):
+# Append newly downloaded years to the Zarr store
+def append_netcdf_to_zarr(new_files, stored_files, stored_times):
     """
-    Process precipitation data, resample to daily level, and save as parquet
-    
-    Parameters:
-    - nc_file: Path to netCDF file with precipitation data
-    - country_name: Name of the country
-    - bbox: Bounding box of the country (north, south, east, west)
-    - year: Year of the data
+    Append new_files along valid_time; returns False (nothing written) when they do not all come after the store.
+
+    The store is marked incomplete while appending, so an interrupted append makes the next run rebuild it.
     """
-    print(f"Processing precipitation data for {country_name} for year {year}")
-    
-    # Extract coordinates
-    north, south, east, west = bbox
-    
-    # Open the dataset
-    ds = xr.open_dataset(nc_file)
-    
-    # Subset to the country's bounding box
-    subset = ds.sel(latitude=slice(south, north), longitude=slice(west, east))
-    
-    # Convert to dataframe
-    df = subset.to_dataframe().reset_index()
-    
-    # Set datetime as index for resampling
-    df['datetime'] = pd.to_datetime(df['valid_time'])
-    df.set_index('datetime', inplace=True)
-    
-    # Calculate daily precipitation sum (convert from meters to millimeters for easier interpretation)
-    # Group by latitude, longitude, and date
-    daily_precip = df.groupby([pd.Grouper(freq='D'), 'latitude', 'longitude'])['tp'].sum() * 1000  # Convert to mm
-    daily_precip = daily_precip.reset_index()
-    
-    # Rename column for clarity
-    daily_precip.rename(columns={'tp': 'precipitation_mm'}, inplace=True)
-    
-    # Format date as YYYY-MM-DD
-    daily_precip['date'] = daily_precip['datetime'].dt.strftime('%Y-%m-%d')
-    
-    # Save to parquet
-    output_path = os.path.join(OUTPUT_DIR, country_name, f"{country_name}_{year}_precip.parquet")
-    daily_precip.to_parquet(output_path, index=False)
-    print(f"Saved precipitation data to {output_path}")
-    
-    # Close the dataset
+    ds = open_netcdf_files(new_files)
+    if ds['valid_time'].values[0] <= stored_times[-1]:
+        ds.close()
+        return False
+
+    print(f"Appending {len(new_files)} netCDF files to Zarr store {ZARR_STORE}")
+    set_store_attrs(stored_files, complete=False)
+    ds = zarr_ready(ds, stored_hours=len(stored_times))
+    # Appending rewrites the group attributes, so they are carried over until the append has finished
+    ds.attrs = {'source_files': stored_files, 'complete': False}
+    ds.to_zarr(ZARR_STORE, append_dim='valid_time', consolidated=True)
     ds.close()
-    
-    return output_path
+    set_store_attrs({**stored_files, **source_fingerprints(new_files)}, complete=True)
+    return True
+
+# Open the ERA5 data from the Zarr store, building or extending the store first when it is out of date
+def open_era5_data(nc_files):
+    """
+    Open the consolidated Zarr store of the given netCDF files.
 
+    New files after the end of the store are appended; if a file in the store was changed or removed,
+    a new file falls before the end of the store, or an earlier append was interrupted, the store is rebuilt.
+    """
+    fingerprints = source_fingerprints(nc_files)
+    if os.path.exists(ZARR_STORE):
+        # Attributes are read straight from the group, as an interrupted append can leave the arrays inconsistent
+        attrs = dict(zarr.open_group(ZARR_STORE, mode='r').attrs)
+        stored_files = attrs.get('source_files')
+        complete = attrs.get('complete', False)
+
+        if not complete or not isinstance(stored_files, dict):
+            print("Zarr store is incomplete or from an older version; rebuilding it")
+        elif any(fingerprints.get(name) != list(stamp) for name, stamp in stored_files.items()):
+            print("netCDF files in the Zarr store were changed or removed; rebuilding it")
+        else:
+            new_files = sorted(path for path in nc_files if os.path.basename(path) not in stored_files)
+            with xr.open_zarr(ZARR_STORE, consolidated=True, chunks={}) as ds:
+                stored_times = ds['valid_time'].values
+            if not new_files or append_netcdf_to_zarr(new_files, stored_files, stored_times):
+                print(f"Opening Zarr store {ZARR_STORE}")
+                return xr.open_zarr(ZARR_STORE, consolidated=True, chunks={})
+            print("New netCDF files overlap or precede the Zarr store; rebuilding it")
+    convert_netcdf_to_zarr(nc_files)
+    return xr.open_zarr(ZARR_STORE, consolidated=True, chunks={})
+
+def process_era5_data(ds):
+    """Process the ERA5 dataset, containing both temperature and precipitation data for all years."""
+
+    # The grid is the same for every year, so each country's positional slices are looked up once
+    country_indexers = {
+        country_name: bbox_indexers(ds, bbox)
+        for country_name, bbox in country_coordinates.items()
+    }
+
+    # Writes run in worker processes: the daily inputs are small to ship, and Arrow conversion plus
+    # zstd encoding of 25 files then scales across cores while the next year is being computed
+    with ProcessPoolExecutor(max_workers=COUNTRY_WORKERS) as executor:
+        futures = []
+        for year, yearly in ds.groupby('valid_time.year'):
+            print(f"Processing year {year}")
+
+            # Build every country's daily reductions lazily and compute them in one dask call, so chunks
+            # shared by overlapping bounding boxes (e.g. Sudan/South Sudan, Kenya/Uganda/Tanzania) are read once
+            daily = {
+                country_name: process_country_data(yearly, country_name, indexers, year)
+                for country_name, indexers in country_indexers.items()
+            }
+            (daily,) = dask.compute(daily)
+
+            # Surface any failed write from the previous year before queueing this year's
+            for future in futures:
+                future.result()
+            futures = [
+                executor.submit(save_country_data, country_daily, country_name, year)
+                for country_name, country_daily in daily.items()
+            ]
+        for future in futures:
+            future.result()
+
+    ds.close()
 
-def process_temperature_file(nc_file, country_name, bbox, year):
+# Positional slice of the coordinate values that fall within [low, high]
+def coordinate_slice(values, low, high):
+    """Works for ascending and descending coordinates (ERA5 latitude runs north to south)."""
+    if values[0] <= values[-1]:
+        return slice(int(np.searchsorted(values, low, 'left')), int(np.searchsorted(values, high, 'right')))
+    ascending = values[::-1]
+    return slice(
+        len(values) - int(np.searchsorted(ascending, high, 'right')),
+        len(values) - int(np.searchsorted(ascending, low, 'left')),
+    )
+
+# Integer indexers selecting a bounding box from the dataset's grid
+def bbox_indexers(ds, bbox):
     """
-    Process temperature data, resample to daily level, and save as parquet
+    Translate a bounding box into isel indexers
     
     Parameters:
-    - nc_file: Path to netCDF file with temperature data
-    - country_name: Name of the country
+    - ds: xarray Dataset with latitude and longitude coordinates
     - bbox: Bounding box of the country (north, south, east, west)
-    - year: Year of the data
     """
-    print(f"Processing temperature data for {country_name} for year {year}")
-    
     # Extract coordinates
-    north, south, east, west = bbox
-    
-    # Open the dataset
-    ds = xr.open_dataset(nc_file)
-    
-    # Subset to the country's bounding box
-    subset = ds.sel(latitude=slice(south, north), longitude=slice(west, east))
-    
-    # Convert to dataframe
-    df = subset.to_dataframe().reset_index()
-    
-    # Set datetime as index for resampling
-    df['datetime'] = pd.to_datetime(df['valid_time'])
-    df.set_index('datetime', inplace=True)
-    
-    # Convert temperature from Kelvin to Celsius
-    df['t2m_celsius'] = df['t2m'] - 273.15
-    
-    # Calculate daily mean and max temperature
-    # Group by latitude, longitude, and date
-    daily_temp = df.groupby([pd.Grouper(freq='D'), 'latitude', 'longitude'])['t2m_celsius'].agg(
-        temp_mean=np.mean,
-        temp_max=np.max
-    ).reset_index()
-    
-    # Format date as YYYY-MM-DD
-    daily_temp['date'] = daily_temp['datetime'].dt.strftime('%Y-%m-%d')
-    
-    # Save to parquet
-    output_path = os.path.join(OUTPUT_DIR, country_name, f"{country_name}_{year}_temp.parquet")
-    daily_temp.to_parquet(output_path, index=False)
-    print(f"Saved temperature data to {output_path}")
-    
-    # Close the dataset
-    ds.close()
-    
-    return output_path
-
-
-
-def process_netcdf_file(nc_file):
-    """Process a single netCDF file containing both temperature and precipitation data."""
-    print(f"Processing netCDF file: {nc_file}")
+    north, south, east, west = bbox['north'], bbox['south'], bbox['east'], bbox['west']
 
-    # Open the dataset
-    ds = xr.open_dataset(nc_file)
-
-    # Determine the year from the file
-    year = extract_year_from_netcdf(ds)
-
-    # Process each country:
-    for country_name, bbox in country_coordinates.items():
-        process_country_data(ds, country_name, bbox, year)
+    # Assertions to validate bounding box
+    assert north > south, "North coordinate must be greater than South coordinate"
+    assert east > west, "East coordinate must be greater than West coordinate"
 
-    ds.close()
+    return {
+        'latitude': coordinate_slice(ds['latitude'].values, south, north),
+        'longitude': coordinate_slice(ds['longitude'].values, west, east),
+    }
 
 # Function to process data for a specific country
-def process_country_data(ds, country_name, bbox, year):
+def process_country_data(ds, country_name, indexers, year):
     """
-    Process climate data for a specific country and save as parquet files
+    Build the (lazy) daily climate data for a specific country
     
     Parameters:
     - ds: xarray Dataset containing both temperature and precipitation data
     - country_name: Name of the country
-    - bbox: Bounding box of the country (north, south, east, west)
+    - indexers: Positional latitude/longitude slices of the country's bounding box
     - year: Year of the data
-    """
-    print(f"Processing data for {country_name} for year {year}")
 
-    # Extract coordinates
-    north, south, east, west = bbox
+    Returns:
+    - dict with the daily 'precip' and/or 'temp' results
+    """
+    # Outputs written by an earlier run are kept unless CF_FORCE=1
+    existing = {
+        suffix for suffix in ('precip', 'temp')
+        if not FORCE and os.path.exists(country_output_path(country_name, year, suffix))
+    }
+    if len(existing) == 2:
+        print(f"Skipping {country_name} for year {year}: output files already exist")
+        return {}
 
-    # Assertions to validate bounding box
-    assert north > south, "North coordinate must be greater than South coordinate"
-    assert east > west, "East coordinate must be greater than West coordinate"
+    print(f"Processing data for {country_name} for year {year}")
 
     # Subset to the country's bounding box
-    subset = ds.sel(latitude = slice(south, north), longitude=slice(west, east))
-
-    # Convert to dataframe
-    df = subset.to_dataframe().reset_index()
-
-    # Set datetime as index for resampling
-    df['datetime'] = pd.to_datetime(df['valid_time'])
-    df.set_index('datetime', inplace=True)
+    subset = ds.isel(indexers)
+    daily = {}
 
     # Process precipitation data
-    if 'tp' in df.columns:
-        process_precipitation_data(df, country_name, year)
-    else:
+    if 'tp' not in subset.data_vars:
         print(f"Warning: No precipitation data (tp) found for {country_name}_{year}")
+    elif 'precip' not in existing:
+        daily['precip'] = process_precipitation_data(subset)
 
     # Process temperature data
-    if 't2m' in df.columns:
-        process_temperature_data(df, country_name, year)
-    else:
+    if 't2m' not in subset.data_vars:
         print(f"Warning: No temperature data (t2m) found for {country_name}")
+    elif 'temp' not in existing:
+        daily['temp'] = process_temperature_data(subset)
 
-# Function to process precipitation data
-def process_precipitation_data(df, country_name, year):
-    """Process precipitation data and save as Parquet."""
+    return daily
 
-    # calculate daily precipitation sum (convert from meters to milimeters for easier interpretation)
-    # group by latitude, longitude and date
-    # Important: in this stage, the conversion to millimeters is done by multiplying by 1000
-    daily_precip = df.groupby([pd.Grouper(freq='D'), 'latitude', 'longitude'])['tp'].sum() * 1000
-    daily_precip = daily_precip.reset_index()
+# Path of a country-year output file; suffix is 'precip' or 'temp'
+def country_output_path(country_name, year, suffix):
+    return os.path.join(OUTPUT_DIR, country_name, f"{country_name}_{year}_{suffix}.parquet")
 
-    # rename column for clarity
-    daily_precip.rename(columns={'tp': 'precip'}, inplace = True)
+# Save the computed daily data of one country-year as parquet files
+def save_country_data(daily, country_name, year):
+    """Flatten each computed daily result and write it to the country's folder."""
+    for suffix, label in (('precip', 'precipitation'), ('temp', 'temperature')):
+        if suffix not in daily:
+            continue
+        output_path = country_output_path(country_name, year, suffix)
+        write_parquet(daily_to_table(daily[suffix]), output_path)
+        print(f"Saved {label} data to {output_path}")
+
+# Turn a daily (valid_time, latitude, longitude) result into the long output table
+def daily_to_table(daily):
+    """Flatten daily xarray results to an Arrow table with one row per day and grid cell, sorted by day, latitude and longitude."""
+    if isinstance(daily, xr.DataArray):
+        daily = daily.to_dataset()
+    # Sorting the grid axes makes the C-order flattening come out in (day, latitude, longitude) order
+    daily = daily.reset_coords(drop=True).sortby(['latitude', 'longitude']).transpose('valid_time', 'latitude', 'longitude')
+
+    # Build the key columns by repeating the coordinate axes, so no pandas MultiIndex is ever created.
+    # The 0.25 degree grid is exact in float32, and ERA5 values carry no more precision than float32 either
+    times = daily['valid_time'].values
+    lats = daily['latitude'].values.astype('float32')
+    lons = daily['longitude'].values.astype('float32')
+    columns = {
+        'datetime': np.repeat(times, lats.size * lons.size),
+        'latitude': np.tile(np.repeat(lats, lons.size), times.size),
+        'longitude': np.tile(lons, times.size * lats.size),
+    }
+    for name, values in daily.data_vars.items():
+        # from_pandas=True stores NaN as null, as the pandas writer did
+        columns[name] = pa.array(values.values.astype('float32', copy=False).ravel(), from_pandas=True)
+    return pa.table(columns)
+
+# Write a daily output table to parquet
+def write_parquet(table, output_path):
+    """Write an Arrow table with zstd compression and fixed row groups."""
+    # Write under a temporary name and rename, so an interrupted run never leaves a partial file that the skip check would trust
+    pq.write_table(
+        table,
+        f"{output_path}.tmp",
+        compression=PARQUET_COMPRESSION,
+        compression_level=PARQUET_COMPRESSION_LEVEL,
+        row_group_size=PARQUET_ROW_GROUP_SIZE,
+        use_dictionary=PARQUET_DICTIONARY_COLUMNS,
+    )
+    os.replace(f"{output_path}.tmp", output_path)
 
-    # format date as YYYY-MM-DD
-    daily_precip['date'] = daily_precip['datetime'].dt.strftime('%Y-%m-%d')
+# Function to process precipitation data
+def process_precipitation_data(subset):
+    """Daily precipitation totals in millimetres."""
 
-    # save to parquet
-    output_path = os.path.join(OUTPUT_DIR, country_name, f"{country_name}_{year}_precip.parquet")
-    daily_precip.to_parquet(output_path, index = False)
-    print(f"Saved precipitation data to {output_path}")
+    # calculate daily precipitation sum (convert from meters to milimeters for easier interpretation)
+    # the daily reduction runs on the (time, lat, lon) array, so only daily rows are ever flattened into the output table
+    # Important: in this stage, the conversion to millimeters is done by multiplying by 1000
+    daily = subset['tp'].resample(valid_time='1D').sum() * 1000
+    return daily.rename('precip')
 
 # Function to process temperature data
-def process_temperature_data(df, country_name, year):
-    """Process temperature data and save as Parquet."""
+def process_temperature_data(subset):
+    """Daily mean and max temperatures in Celsius."""
     
-    # convert temperature data from Kelvin to Celsius
-    df['temp']= df['t2m'] - 273.15
-
-    # calculate daily mean and max temperatures
-    daily_temp = df.groupby([pd.Grouper(freq='D'), 'latitude', 'longitude'])['temp'].agg(
-        temp_mean = np.mean,
-        temp_max = np.max
-    ).reset_index()
-
-    # Format date as YYYY-MM-DD
-    daily_temp['date'] = daily_temp['datetime'].dt.strftime('%Y-%m-%d')
-
-    # Save to parquet
-    output_path = os.path.join(OUTPUT_DIR, country_name, f"{country_name}_{year}_temp.parquet")
-    daily_temp.to_parquet(output_path, index = False)
-    print(f"Saved temperature data to {output_path}")
+    # calculate daily mean and max temperatures, converting from Kelvin to Celsius afterwards:
+    # both statistics commute with the constant shift, so it is applied per day instead of per hour
+    daily = subset['t2m'].resample(valid_time='1D')
+    return xr.Dataset({
+        'temp_mean': daily.mean() - 273.15,
+        'temp_max': daily.max() - 273.15,
+    })
 
 # Main workflow function to process all netCDF files
 def main():
@@ -395,9 +413,8 @@ def main():
     else:
         print(f"Found {len(nc_files)} netCDF files in {INPUT_DIR}.")
 
-    # Process each netCDF file
-    for nc_file in nc_files:
-        process_netcdf_file(nc_file)
+    # Process all years together, read from the Zarr store
+    process_era5_data(open_era5_data(nc_files))
     
     print("All files processed successfully!")
 
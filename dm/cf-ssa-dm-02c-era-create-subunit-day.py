@@ -21,9 +21,11 @@ from typing import Dict, List, Optional, Tuple, Union, Iterator
 import geopandas as gpd
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
-from fuzzywuzzy import process
-from shapely.geometry import Polygon, box
+from rapidfuzz import fuzz, process, utils
+import shapely
 from tqdm import tqdm
 
 
@@ -208,11 +210,21 @@ class ClimateDataProcessor:
         # Initialize attributes
         self.country_dir = None
         self.admin_gdf = None
+        self._admin_lonlat = None
+        self._admin_unit_ids = None
         self.grid_gdf = None
         self.intersection_gdf = None
         self.start_year = None
         self.end_year = None
 
+    def _exact_country_match(self, candidates) -> Optional[str]:
+        """Return the candidate equal to the country name ignoring case and whitespace, if any."""
+        target = self.country_name.strip().lower()
+        for candidate in candidates:
+            if isinstance(candidate, str) and candidate.strip().lower() == target:
+                return candidate
+        return None
+
     def _match_country_name(self, available_countries: List[str]) -> str:
         """Fuzzy match country name against available folders."""
         self.logger.step(1, "Country Name Matching")
@@ -226,13 +238,21 @@ class ClimateDataProcessor:
                 raise ValueError(error_msg)
             return self.country_name
         
+        # A case-insensitive exact match needs no fuzzy scoring
+        matched_name = self._exact_country_match(available_countries)
+        if matched_name is not None:
+            self.logger.info(f"✅ Match found: '{matched_name}' (case-insensitive exact match)")
+            return matched_name
+        
         # Fuzzy matching
         self.logger.info(f"Performing fuzzy match for: {self.country_name}")
         self.logger.info(f"Available countries: {', '.join(available_countries)}")
         
-        matches = process.extractBests(
+        matches = process.extract(
             self.country_name, 
             available_countries, 
+            scorer=fuzz.WRatio,
+            processor=utils.default_process,
             score_cutoff=80, 
             limit=2
         )
@@ -339,8 +359,10 @@ class ClimateDataProcessor:
         
         self.logger.info(f"Loading shapefile: {self.shapefile_path}")
         
+        # Only the columns used below are read; pyogrio skips any that are absent, so the check below still catches them
+        required_cols = ["CNTRY_CD", self.smallest_unit_col, self.country_col, "geometry"]
         try:
-            gdf = gpd.read_file(self.shapefile_path)
+            gdf = gpd.read_file(self.shapefile_path, engine="pyogrio", columns=required_cols[:-1])
             self.logger.info(f"✅ Shapefile loaded successfully: {len(gdf)} records")
         except Exception as e:
             error_msg = f"Failed to load shapefile: {e}"
@@ -357,7 +379,6 @@ class ClimateDataProcessor:
         self.logger.summary_table("Shapefile Information", shapefile_info)
         
         # Verify required columns
-        required_cols = ["CNTRY_CD", self.smallest_unit_col, self.country_col, "geometry"]
         missing_cols = [col for col in required_cols if col not in gdf.columns]
         if missing_cols:
             error_msg = f"Shapefile missing required columns: {missing_cols}"
@@ -371,20 +392,27 @@ class ClimateDataProcessor:
         print(available_countries)
         self.logger.info(f"Available countries in shapefile: {len(available_countries)}")
         
-        country_matches = process.extractBests(
-            self.country_name,
-            available_countries,
-            score_cutoff=90,
-            limit=1
-        )
-        
-        if not country_matches:
-            error_msg = f"No matching country found in shapefile for: {self.country_name}"
-            self.logger.error(error_msg)
-            raise ValueError(error_msg)
+        # A case-insensitive exact match needs no fuzzy scoring
+        matched_country = self._exact_country_match(available_countries)
+        if matched_country is not None:
+            confidence = 100.0
+        else:
+            country_matches = process.extract(
+                self.country_name,
+                list(available_countries),
+                scorer=fuzz.WRatio,
+                processor=utils.default_process,
+                score_cutoff=90,
+                limit=1
+            )
             
-        matched_country = country_matches[0][0]
-        confidence = country_matches[0][1]
+            if not country_matches:
+                error_msg = f"No matching country found in shapefile for: {self.country_name}"
+                self.logger.error(error_msg)
+                raise ValueError(error_msg)
+                
+            matched_country = country_matches[0][0]
+            confidence = country_matches[0][1]
         self.logger.info(f"✅ Country matched: '{matched_country}' (confidence: {confidence:.1f}%)")
         
         # Get country code and filter
@@ -416,11 +444,22 @@ class ClimateDataProcessor:
         
         # Dissolve to smallest units
         self.logger.info("Dissolving to smallest administrative units...")
-        dissolved_gdf = filtered_gdf.dissolve(by=self.smallest_unit_col, as_index=False)
-        dissolved_gdf = dissolved_gdf[[self.smallest_unit_col, "geometry"]].copy()
+        # Only the geometry is needed, so each unit's polygons are unioned directly instead of
+        # having dissolve also aggregate every other column
+        unions = filtered_gdf.geometry.groupby(filtered_gdf[self.smallest_unit_col]).agg(
+            lambda geoms: shapely.unary_union(geoms.to_numpy())
+        )
+        dissolved_gdf = gpd.GeoDataFrame(
+            {self.smallest_unit_col: unions.index.to_numpy()},
+            geometry=unions.to_numpy(),
+            crs=filtered_gdf.crs
+        )
         dissolved_gdf = dissolved_gdf.to_crs("EPSG:4326")  # Ensure WGS84
+        # Unit ids as a categorical column, so joins and groupbys downstream work on integer codes
+        dissolved_gdf[self.smallest_unit_col] = dissolved_gdf[self.smallest_unit_col].astype("category")
         
         self.admin_gdf = dissolved_gdf
+        self._store_admin_centroids()
 
         # Check how many SMALLEST units there are in the shapefile before and after dissolve
         pre_subunits = sorted(filtered_gdf[self.smallest_unit_col].unique())
@@ -439,6 +478,12 @@ class ClimateDataProcessor:
         }
         self.logger.summary_table("Administrative Boundaries Summary", admin_summary)
 
+    def _store_admin_centroids(self) -> None:
+        """Compute the admin unit centroids once, as a (unit, 2) lon/lat array, for the interpolation methods."""
+        centroids = self.admin_gdf.geometry.centroid
+        self._admin_lonlat = np.column_stack([centroids.x.to_numpy(), centroids.y.to_numpy()])
+        self._admin_unit_ids = self.admin_gdf[self.smallest_unit_col].to_numpy()
+
     def _create_grid_from_first_file(self, first_file: Path) -> None:
         """Create grid geometry from the first file with detailed logging."""
         self.logger.step(5, "Grid Creation")
@@ -446,36 +491,47 @@ class ClimateDataProcessor:
         self.logger.info(f"Creating grid from: {first_file.name}")
         
         try:
-            # Read coordinates
-            df = pd.read_parquet(
-                first_file, 
-                columns=["latitude", "longitude"],
-                engine="pyarrow"
-            )
-            self.logger.info(f"✅ File read successfully: {len(df)} coordinate records")
+            # Read coordinates of a single timestep: every timestep covers the full grid, so filtering on the
+            # first timestamp in row group 0 gives all cells whatever the row order, and the row-group
+            # statistics let pyarrow skip the rest of a time-sorted file. Without a time column or
+            # statistics, both coordinate columns are read in full
+            parquet_file = pq.ParquetFile(first_file)
+            filters = None
+            time_col = next((col for col in ("valid_time", "datetime") if col in parquet_file.schema_arrow.names), None)
+            if time_col is not None and parquet_file.metadata.num_row_groups > 0:
+                column_index = parquet_file.schema_arrow.get_field_index(time_col)
+                stats = parquet_file.metadata.row_group(0).column(column_index).statistics
+                if stats is not None and stats.has_min_max:
+                    filters = [(time_col, "==", stats.min)]
+            table = pq.read_table(first_file, columns=["latitude", "longitude"], filters=filters)
+            self.logger.info(f"✅ File read successfully: {table.num_rows} coordinate records")
         except Exception as e:
             error_msg = f"Failed to read first file: {e}"
             self.logger.error(error_msg)
             raise ValueError(error_msg)
             
-        if df.empty:
+        if table.num_rows == 0:
             error_msg = "First file is empty"
             self.logger.error(error_msg)
             raise ValueError(error_msg)
 
-        # Process coordinates
+        # Process coordinates: round, deduplicate and sort in Arrow, converting to pandas only at the end.
+        # They stay float64 here, as the grid steps and cell edges are derived from them
         self.logger.info("Processing coordinates...")
-        df["latitude"] = df["latitude"].round(3)
-        df["longitude"] = df["longitude"].round(3)
-
-        unique_coords = df.drop_duplicates()
-        unique_coords = unique_coords.sort_values(["latitude", "longitude"])
+        table = pa.table({
+            col: pc.round(pc.cast(table[col], pa.float64()), 3) for col in ["latitude", "longitude"]
+        })
+        unique_coords = (
+            table.group_by(["latitude", "longitude"]).aggregate([])
+            .sort_by([("latitude", "ascending"), ("longitude", "ascending")])
+            .to_pandas()
+        )
         
         coord_summary = {
-            "Total Records": len(df),
+            "Total Records": table.num_rows,
             "Unique Coordinates": len(unique_coords),
-            "Latitude Range": f"[{df['latitude'].min():.3f}, {df['latitude'].max():.3f}]",
-            "Longitude Range": f"[{df['longitude'].min():.3f}, {df['longitude'].max():.3f}]"
+            "Latitude Range": f"[{unique_coords['latitude'].min():.3f}, {unique_coords['latitude'].max():.3f}]",
+            "Longitude Range": f"[{unique_coords['longitude'].min():.3f}, {unique_coords['longitude'].max():.3f}]"
         }
         self.logger.summary_table("Coordinate Summary", coord_summary)
         
@@ -521,29 +577,24 @@ class ClimateDataProcessor:
         }
         self.logger.summary_table("Grid Resolution", grid_resolution)
         
-        # Create grid cells
+        # Create grid cells: corner arrays for all cells at once, boxes built in a single shapely call
         self.logger.info("Creating grid cell geometries...")
-        geometries = []
-        invalid_count = 0
+        lons = unique_coords["longitude"].to_numpy()
+        lats = unique_coords["latitude"].to_numpy()
         
-        for i, (_, row) in enumerate(unique_coords.iterrows()):
-            lat, lon = row["latitude"], row["longitude"]
-            
-            min_lon = lon - lon_step/2
-            max_lon = lon + lon_step/2
-            min_lat = lat - lat_step/2
-            max_lat = lat + lat_step/2
-            
-            # Ensure valid coordinates
-            if min_lon >= max_lon:
-                max_lon = min_lon + 0.001
-                invalid_count += 1
-            if min_lat >= max_lat:
-                max_lat = min_lat + 0.001
-                invalid_count += 1
-                
-            cell = box(min_lon, min_lat, max_lon, max_lat)
-            geometries.append(cell)
+        min_lon = lons - lon_step/2
+        max_lon = lons + lon_step/2
+        min_lat = lats - lat_step/2
+        max_lat = lats + lat_step/2
+        
+        # Ensure valid coordinates
+        bad_lon = min_lon >= max_lon
+        bad_lat = min_lat >= max_lat
+        max_lon = np.where(bad_lon, min_lon + 0.001, max_lon)
+        max_lat = np.where(bad_lat, min_lat + 0.001, max_lat)
+        invalid_count = int(bad_lon.sum() + bad_lat.sum())
+        
+        geometries = shapely.box(min_lon, min_lat, max_lon, max_lat)
         
         if invalid_count > 0:
             self.logger.warning(f"Fixed {invalid_count} cells with invalid bounds")
@@ -551,36 +602,20 @@ class ClimateDataProcessor:
         self.logger.info(f"Created {len(geometries)} grid cell geometries")
         
         # Create GeoDataFrame
+        # float32 holds the 3-decimal coordinates and halves the memory of the intersection and merge keys;
+        # it is applied only to the stored columns, after the cell geometries are built in float64
         grid_gdf = gpd.GeoDataFrame(
-            unique_coords,
+            unique_coords.astype({"latitude": "float32", "longitude": "float32"}),
             geometry=geometries,
             crs="EPSG:4326"
         )
         
-        # Validate geometries
-        valid_geometries = grid_gdf.geometry.is_valid
-        valid_count = valid_geometries.sum()
-        
-        geometry_validation = {
+        # Boxes with min < max bounds (enforced above) are always valid, so no GEOS validity scan is run
+        geometry_summary = {
             "Total Geometries": len(grid_gdf),
-            "Valid Geometries": valid_count,
-            "Invalid Geometries": len(grid_gdf) - valid_count,
-            "Validation Rate": f"{100 * valid_count / len(grid_gdf):.1f}%"
+            "Cells with Fixed Bounds": invalid_count
         }
-        self.logger.summary_table("Geometry Validation", geometry_validation)
-        
-        if valid_count == 0:
-            self.logger.error("No valid geometries created!")
-            # Log sample geometry details for debugging
-            for i, geom in enumerate(geometries[:3]):
-                bounds = geom.bounds
-                self.logger.error(f"Sample geometry {i}: bounds = {bounds}, is_valid = {geom.is_valid}")
-            raise ValueError("Failed to create any valid grid geometries")
-        
-        # Keep only valid geometries
-        if valid_count < len(grid_gdf):
-            self.logger.warning(f"Removing {len(grid_gdf) - valid_count} invalid geometries")
-            grid_gdf = grid_gdf[valid_geometries].copy()
+        self.logger.summary_table("Geometry Construction", geometry_summary)
         
         self.grid_gdf = grid_gdf
         
@@ -641,51 +676,40 @@ class ClimateDataProcessor:
         """Assign weather data from nearest admin unit for missing values."""
         self.logger.info("Performing nearest neighbor assignment")
 
-        # Get centroids of all admin units
-        admin_centroids = self.admin_gdf.copy()
-        admin_centroids['centroid'] = admin_centroids.geometry.centroid
-        admin_centroids['longitude'] = admin_centroids.centroid.x 
-        admin_centroids['latitude'] = admin_centroids.centroid.y 
-
         # Create spatial index for fast nearest neighbor search
-        from scipy.spatial import ckdtree
+        from scipy.spatial import cKDTree
 
-        valid_units = admin_centroids[~admin_centroids[self.smallest_unit_col].isin(self.units_without_data)]
-        dropped_units = admin_centroids[admin_centroids[self.smallest_unit_col].isin(self.units_without_data)]
+        dropped = np.isin(self._admin_unit_ids, self.units_without_data)
 
-        if valid_units.empty or dropped_units.empty:
+        if dropped.all() or not dropped.any():
             return final_df 
         
-        tree = ckdtree(valid_units[['longitude', 'latitude']].values)
-
-        interpolation_results = []
-        success_count = 0 
-
-        for _, dropped_unit in dropped_units.iterrows():
-            try:
-                dist, idx = tree.query([dropped_unit.longitude, dropped_unit.latitude], k = 1)
-                nearest_valid_unit = valid_units.iloc[idx][self.smallest_unit_col]
-
-                # Get all the data for nearest valid unit 
-                valid_data = final_df[final_df[self.smallest_unit_col] == nearest_valid_unit].copy()
-
-                if not valid_data.empty:
-                    # Replace the admin unit ID but keep all weather data 
-                    valid_data[self.smallest_unit_col] = dropped_unit[self.smallest_unit_col]
-                    interpolation_results.append(valid_data)
-                    success_count += 1
-                
-            except Exception as e:
-                self.logger.warning(f"Failed to interpolate for {dropped_unit[self.smallest_unit_col]}: {e}")
-
-            if interpolation_results:
-                interpolated_data = pd.concat(interpolation_results, ignore_index = True)
-                final_df  = pd.concat([final_df, interpolated_data], ignore_index = True)
+        tree = cKDTree(self._admin_lonlat[~dropped])
+
+        # Query the nearest valid unit of every dropped unit in one call
+        _, idxs = tree.query(self._admin_lonlat[dropped], k=1)
+        recipients = self._admin_unit_ids[dropped]
+        donors = self._admin_unit_ids[~dropped][idxs]
+
+        # Copy each donor's rows to its recipient with one positional take: the row positions of every
+        # unit are looked up once, then repeated per recipient and relabelled
+        groups = final_df.groupby(self.smallest_unit_col, sort=False, observed=True).indices
+        has_data = np.array([donor in groups for donor in donors], dtype=bool)
+        recipients, donors = recipients[has_data], donors[has_data]
+        success_count = len(recipients)
+
+        # The recipients' empty rows from the complete date index are replaced by the interpolated ones
+        if success_count:
+            rows = np.concatenate([groups[donor] for donor in donors])
+            new_units = np.repeat(recipients, [len(groups[donor]) for donor in donors])
+            interpolated_data = final_df.iloc[rows].assign(**{self.smallest_unit_col: new_units})
+            final_df = final_df[~final_df[self.smallest_unit_col].isin(recipients)]
+            final_df = pd.concat([final_df, interpolated_data], ignore_index = True)
 
-                success_rate = (success_count / len(self.units_without_data)) * 100
-                self.logger.info(f"Nearest neighbor completed: {success_count}/{len(self.units_without_data)} units ({success_rate:.1f}%)")
+        success_rate = (success_count / len(self.units_without_data)) * 100
+        self.logger.info(f"Nearest neighbor completed: {success_count}/{len(self.units_without_data)} units ({success_rate:.1f}%)")
 
-                return final_df 
+        return final_df 
             
     def _assign_buffered_weather(self, final_df: pd.DataFrame) -> pd.DataFrame:
         """ Assign weather data using buffered search for nearby grid cells"""
@@ -694,31 +718,23 @@ class ClimateDataProcessor:
         # Convert buffer from km to degrees (approx)
         buffer_deg = self.buffer_radius_km / 111.32 
 
-        # Prepare admin units with centroids
-        admin_centroids = self.admin_gdf.copy()
-        admin_centroids['centroid'] = admin_centroids.geometry.centroid
-        admin_centroids['longitude'] = admin_centroids.centroid.x 
-        admin_centroids['latitude'] = admin_centroids.centroid.y 
+        # Buffers around the centroids of the dropped units
+        dropped = np.isin(self._admin_unit_ids, self.units_without_data)
+        buffer_geoms = shapely.buffer(shapely.points(self._admin_lonlat[dropped]), buffer_deg)
 
-        dropped_units = admin_centroids[admin_centroids[self.smallest_unit_col].isin(self.units_without_data)]
-    
         interpolation_results = []
         success_count = 0
 
-        for _, dropped_unit in dropped_units.iterrows():
+        for dropped_unit, buffer_geom in zip(self._admin_unit_ids[dropped], buffer_geoms):
             try:
-                # Create buffer around centroid
-                buffer_geom = dropped_unit.centroid(buffer(buffer_deg))
-
-                # Find intersecting grid cells
-                intersecting_grid = self.grid_gdf[self.grid_gdf.intersects(buffer_geom)]
+                # Find intersecting grid cells through the grid's spatial index, so each buffer only tests the cells near it
+                intersecting_grid = self.grid_gdf.iloc[self.grid_gdf.sindex.query(buffer_geom, predicate="intersects")]
 
                 if not intersecting_grid.empty:
                     # Get weather data for these grid cells
-                    grid_coords = list(zip(intersecting_grid.latitude, intersecting_grid.longitude))
-                    relevant_intersections = self.intersection_gdf[
-                        self.intersection_gdf[['latitude', 'longitude']].apply(tuple, axis = 1).isin(grid_coords)
-                    ]
+                    relevant_intersections = self.intersection_gdf.merge(
+                        intersecting_grid[['latitude', 'longitude']], on=['latitude', 'longitude']
+                    )
                     
                     if not relevant_intersections.empty:
                         # We use the average of nearby grid cells
@@ -729,7 +745,7 @@ class ClimateDataProcessor:
                             # Create records for the dates
                             date_range = final_df[['year', 'month', 'day']].drop_duplicates
             except Exception as e:
-                self.logger.warning(f"Failed buffer interpolation for {dropped_unit[self.smallest_unit_col]}: {e}")
+                self.logger.warning(f"Failed buffer interpolation for {dropped_unit}: {e}")
 
         if interpolation_results:
             interpolated_data = pd.concat(interpolation_results, ignore_index=True)
@@ -742,12 +758,62 @@ class ClimateDataProcessor:
     
     def _assign_idw_weather(self, final_df: pd.DataFrame) -> pd.DataFrame:
         """Assign weather data using Inverse Distance Weighting."""
-        self.logger.info("Performing IDW interpolation...")
-        self.logger.warning("IDW interpolation not yet implemented - using nearest neighbor instead")
-        
-        # Placeholder: I haven't yet figured out how to set up IDW. 
-        # For now, fall back to nearest neighbor
-        return self._assign_nearest_neighbor_weather(final_df)
+        self.logger.info(f"Performing IDW interpolation (neighbors: {self.max_neighbors}, power: {self.idw_power})...")
+
+        from scipy.spatial import cKDTree
+
+        weather_cols = ["temp_mean", "temp_max", "precip"]
+        dropped = np.isin(self._admin_unit_ids, self.units_without_data)
+
+        if dropped.all() or not dropped.any():
+            return final_df
+
+        valid_ids = self._admin_unit_ids[~dropped]
+        recipient_ids = self._admin_unit_ids[dropped]
+
+        # Distances and indices of the k nearest valid units of every recipient, shape (recipients, k)
+        k = min(self.max_neighbors, len(valid_ids))
+        tree = cKDTree(self._admin_lonlat[~dropped])
+        dists, idxs = tree.query(self._admin_lonlat[dropped], k=k)
+        dists = dists.reshape(len(recipient_ids), k)
+        idxs = idxs.reshape(len(recipient_ids), k)
+
+        # Dense (valid unit, date, variable) tensor of the donor weather data
+        donor_rows = final_df[final_df[self.smallest_unit_col].isin(valid_ids)]
+        unit_codes = pd.Categorical(donor_rows[self.smallest_unit_col], categories=valid_ids).codes
+        date_keys = donor_rows["year"] * 10000 + donor_rows["month"] * 100 + donor_rows["day"]
+        date_codes, dates = pd.factorize(date_keys, sort=True)
+        donor_tensor = np.full((len(valid_ids), len(dates), len(weather_cols)), np.nan)
+        donor_tensor[unit_codes, date_codes] = donor_rows[weather_cols].to_numpy(dtype="float64")
+
+        # Shepard weights; a donor at zero distance gets (almost) all the weight
+        with np.errstate(divide="ignore"):
+            weights = np.where(dists == 0, 1e12, 1.0 / dists ** self.idw_power)
+
+        # Weighted average over the k donors, normalised per value so missing donor values are skipped
+        donor_values = donor_tensor[idxs]  # (recipients, k, dates, variables)
+        present = ~np.isnan(donor_values)
+        weighted_sum = np.einsum("uk,uktv->utv", weights, np.where(present, donor_values, 0.0))
+        weight_total = np.einsum("uk,uktv->utv", weights, present)
+        with np.errstate(invalid="ignore"):
+            interpolated = weighted_sum / weight_total
+
+        n_dates = len(dates)
+        interpolated_data = pd.DataFrame({
+            self.smallest_unit_col: np.repeat(recipient_ids, n_dates),
+            "COUNTRY": self.country_name,
+            "year": np.tile(dates // 10000, len(recipient_ids)),
+            "month": np.tile(dates // 100 % 100, len(recipient_ids)),
+            "day": np.tile(dates % 100, len(recipient_ids)),
+            **{col: interpolated[:, :, i].ravel() for i, col in enumerate(weather_cols)},
+        })[final_df.columns]
+
+        # The recipients' empty rows from the complete date index are replaced by the interpolated ones
+        final_df = final_df[~final_df[self.smallest_unit_col].isin(recipient_ids)]
+        final_df = pd.concat([final_df, interpolated_data], ignore_index=True)
+
+        self.logger.info(f"IDW completed: {len(recipient_ids)}/{len(self.units_without_data)} units")
+        return final_df
     
     def _calculate_buffer_average(self, intersections: pd.DataFrame, final_df: pd.DataFrame) -> Optional[Dict]:
         """Calculate average weather values from buffer intersections."""
@@ -875,29 +941,18 @@ class ClimateDataProcessor:
         # Geometry preparation
         self.logger.subsection("Geometry Preparation")
         
-        invalid_grid = (~self.grid_gdf.geometry.is_valid).sum()
+        # Grid cells are boxes with min < max bounds, valid by construction, so only the admin polygons are checked
         invalid_admin = (~self.admin_gdf.geometry.is_valid).sum()
         
         geometry_status = {
-            "Invalid Grid Geometries": invalid_grid,
             "Invalid Admin Geometries": invalid_admin
         }
         self.logger.summary_table("Geometry Validation Status", geometry_status)
         
-        if invalid_grid > 0:
-            self.logger.warning(f"Attempting to fix {invalid_grid} invalid grid geometries...")
-            self.grid_gdf = self.grid_gdf.copy()
-            invalid_geoms = ~self.grid_gdf.geometry.is_valid
-            self.grid_gdf.loc[invalid_geoms, 'geometry'] = self.grid_gdf.loc[invalid_geoms, 'geometry'].buffer(0.0001)
-            
-            still_invalid = (~self.grid_gdf.geometry.is_valid).sum()
-            if still_invalid > 0:
-                self.logger.warning(f"Removing {still_invalid} geometries that couldn't be fixed")
-                self.grid_gdf = self.grid_gdf[self.grid_gdf.geometry.is_valid].copy()
-        
         if invalid_admin > 0:
             self.logger.warning(f"Removing {invalid_admin} invalid admin geometries...")
             self.admin_gdf = self.admin_gdf[self.admin_gdf.geometry.is_valid].copy()
+            self._store_admin_centroids()
         
         if len(self.grid_gdf) == 0:
             error_msg = "No valid grid geometries remaining after cleanup!"
@@ -907,31 +962,21 @@ class ClimateDataProcessor:
         # Spatial join
         self.logger.subsection("Spatial Join Operation")
         
-        joined = None
-        predicates_to_try = ['intersects', 'overlaps', 'within']
+        # One bulk query of all grid cells against the admin spatial index (an STRtree that geopandas builds once
+        # and caches on admin_gdf) gives the (grid, admin) pairs; the rows of both sides are then taken by position
+        self.logger.info("Querying admin spatial index with 'intersects' predicate...")
+        grid_geoms = self.grid_gdf.geometry.to_numpy()
+        admin_geoms = self.admin_gdf.geometry.to_numpy()
+        grid_idx, admin_idx = self.admin_gdf.sindex.query(grid_geoms, predicate="intersects")
         
-        for predicate in predicates_to_try:
-            try:
-                self.logger.info(f"Attempting spatial join with '{predicate}' predicate...")
-                joined = gpd.sjoin(
-                    self.grid_gdf,
-                    self.admin_gdf,
-                    how="inner",
-                    predicate=predicate
-                )
-                
-                result_count = len(joined)
-                self.logger.info(f"✅ '{predicate}' succeeded: {result_count} intersections")
-                
-                if result_count > 0:
-                    break
-                    
-            except Exception as e:
-                self.logger.warning(f"'{predicate}' failed: {str(e)}")
-                continue
+        joined = pd.concat([
+            self.grid_gdf.drop(columns="geometry").iloc[grid_idx].reset_index(drop=True),
+            self.admin_gdf.drop(columns="geometry").iloc[admin_idx].reset_index(drop=True),
+        ], axis=1)
+        self.logger.info(f"✅ 'intersects' succeeded: {len(joined)} intersections")
         
-        if joined is None or len(joined) == 0:
-            error_msg = "All spatial join attempts failed!"
+        if len(joined) == 0:
+            error_msg = "Spatial join found no intersections!"
             self.logger.error(error_msg)
             raise ValueError(error_msg)
         
@@ -951,17 +996,12 @@ class ClimateDataProcessor:
         self.logger.subsection("Intersection Geometry Calculation")
         
         self.logger.info("Computing detailed intersection geometries...")
-        joined["intersection_geom"] = joined.apply(
-            lambda row: row["geometry"].intersection(
-                self.admin_gdf.loc[row["index_right"], "geometry"]
-            ),
-            axis=1
-        )
+        intersection_geoms = shapely.intersection(grid_geoms[grid_idx], admin_geoms[admin_idx])
         
         # Area calculations
         self.logger.info("Computing intersection areas...")
-        joined["intersection_area"] = joined["intersection_geom"].area
-        joined["cell_area"] = joined["geometry"].area
+        joined["intersection_area"] = shapely.area(intersection_geoms)
+        joined["cell_area"] = shapely.area(grid_geoms[grid_idx])
         
         # Validation
         valid_mask = (
@@ -1018,11 +1058,11 @@ class ClimateDataProcessor:
         ]].copy()
         
         # Round coordinates
-        result["latitude"] = result["latitude"].round(3)
-        result["longitude"] = result["longitude"].round(3)
+        result["latitude"] = result["latitude"].astype("float64").round(3).astype("float32")
+        result["longitude"] = result["longitude"].astype("float64").round(3).astype("float32")
         
         # Group by coordinates and admin unit
-        result = result.groupby(['latitude', 'longitude', self.smallest_unit_col]).agg({
+        result = result.groupby(['latitude', 'longitude', self.smallest_unit_col], observed=True).agg({
             'intersection_area': 'sum',
             'cell_area': 'first',
             'shr_of_subunit': 'sum'
@@ -1059,25 +1099,25 @@ class ClimateDataProcessor:
         
         # Check schema
         schema = pq.read_schema(file_path)
-        required_cols = {"valid_time", "latitude", "longitude", "temp_mean", "temp_max"}
-        missing_cols = required_cols - set(schema.names)
+        required_cols = ["valid_time", "latitude", "longitude", "temp_mean", "temp_max"]
+        missing_cols = set(required_cols) - set(schema.names)
         if missing_cols:
             error_msg = f"Temperature file missing required columns: {missing_cols}"
             self.logger.error(error_msg)
             raise ValueError(error_msg)
         
-        # Process in chunks
+        # Process in chunks, decoding only the required columns
         chunks = []
         total_merged_rows = 0
         chunk_count = 0
         
-        for chunk in self._read_parquet_chunked(file_path):
+        for chunk in self._read_parquet_chunked(file_path, columns=required_cols):
             chunk_count += 1
             self.logger.debug(f"Processing chunk {chunk_count}: {len(chunk)} rows")
             
             # Round coordinates
-            chunk['latitude'] = chunk['latitude'].round(3)
-            chunk['longitude'] = chunk['longitude'].round(3)
+            chunk['latitude'] = chunk['latitude'].astype('float64').round(3).astype('float32')
+            chunk['longitude'] = chunk['longitude'].astype('float64').round(3).astype('float32')
             
             # Merge with intersection data
             merged = pd.merge(
@@ -1102,7 +1142,7 @@ class ClimateDataProcessor:
             merged["day"] = merged["valid_time"].dt.day
             
             # Aggregate
-            grouped = merged.groupby([self.smallest_unit_col, "year", "month", "day"])
+            grouped = merged.groupby([self.smallest_unit_col, "year", "month", "day"], observed=True)
             result = grouped.apply(
                 lambda x: pd.Series({
                     "temp_mean": self._safe_weighted_average(x["temp_mean"], x["shr_of_subunit"]),
@@ -1157,8 +1197,8 @@ class ClimateDataProcessor:
         
         # Similar implementation to temp file but for precipitation
         schema = pq.read_schema(file_path)
-        required_cols = {"valid_time", "latitude", "longitude", "precip"}
-        missing_cols = required_cols - set(schema.names)
+        required_cols = ["valid_time", "latitude", "longitude", "precip"]
+        missing_cols = set(required_cols) - set(schema.names)
         if missing_cols:
             error_msg = f"Precipitation file missing required columns: {missing_cols}"
             self.logger.error(error_msg)
@@ -1167,10 +1207,10 @@ class ClimateDataProcessor:
         chunks = []
         chunk_count = 0
         
-        for chunk in self._read_parquet_chunked(file_path):
+        for chunk in self._read_parquet_chunked(file_path, columns=required_cols):
             chunk_count += 1
-            chunk['latitude'] = chunk['latitude'].round(3)
-            chunk['longitude'] = chunk['longitude'].round(3)
+            chunk['latitude'] = chunk['latitude'].astype('float64').round(3).astype('float32')
+            chunk['longitude'] = chunk['longitude'].astype('float64').round(3).astype('float32')
             
             merged = pd.merge(
                 chunk,
@@ -1187,7 +1227,7 @@ class ClimateDataProcessor:
             merged["month"] = merged["valid_time"].dt.month
             merged["day"] = merged["valid_time"].dt.day
             
-            grouped = merged.groupby([self.smallest_unit_col, "year", "month", "day"])
+            grouped = merged.groupby([self.smallest_unit_col, "year", "month", "day"], observed=True)
             result = grouped.apply(
                 lambda x: pd.Series({
                     "precip": self._safe_weighted_average(x["precip"], x["shr_of_subunit"])
@@ -1211,7 +1251,7 @@ class ClimateDataProcessor:
         # Combine temperature data
         if temp_dfs:
             temp_combined = pd.concat(temp_dfs, ignore_index=True)
-            temp_combined = temp_combined.groupby([self.smallest_unit_col, "year", "month", "day"]).mean().reset_index()
+            temp_combined = temp_combined.groupby([self.smallest_unit_col, "year", "month", "day"], observed=True).mean().reset_index()
             self.logger.info(f"Combined temperature data: {len(temp_combined)} records")
         else:
             temp_combined = pd.DataFrame(columns=[self.smallest_unit_col, "year", "month", "day", "temp_mean", "temp_max"])
@@ -1220,7 +1260,7 @@ class ClimateDataProcessor:
         # Combine precipitation data
         if precip_dfs:
             precip_combined = pd.concat(precip_dfs, ignore_index=True)
-            precip_combined = precip_combined.groupby([self.smallest_unit_col, "year", "month", "day"]).mean().reset_index()
+            precip_combined = precip_combined.groupby([self.smallest_unit_col, "year", "month", "day"], observed=True).mean().reset_index()
             self.logger.info(f"Combined precipitation data: {len(precip_combined)} records")
         else:
             precip_combined = pd.DataFrame(columns=[self.smallest_unit_col, "year", "month", "day", "precip"])